@@ -0,0 +1,110 @@
+"""
+Microbenchmark: streaming subtitle parsers vs. the legacy whole-file parsers.
+
+Generates synthetic SRT and LRC files with a configurable number of cues, checks that
+both implementations produce the same segments, and reports wall time and peak
+Python heap usage (tracemalloc) for each. Before that, a set of small hand-written
+edge-case files (whitespace-only lines, empty cues, CRLF, BOM, missing final newline)
+is checked for equivalence too.
+
+Usage (from the audio-segmenter directory):
+    python benchmarks/bench_parsers.py --cues 100000
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.subtitle_parser import (  # noqa: E402
+    parse_srt_file, parse_lrc_file, iter_srt_segments, iter_lrc_segments,
+)
+from synthetic import write_lrc, write_srt  # noqa: E402
+
+
+def measure(func):
+    # Time and memory are measured in separate runs: tracemalloc slows allocation heavily
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+# name: (file content, expected (index, text) list, or None to compare with the legacy parser)
+SRT_EDGE_CASES = {
+    'whitespace_line_inside_cue': (
+        "1\n00:00:01,000 --> 00:00:02,000\nHello there\n \nGeneral Kenobi\n\n"
+        "2\n00:00:03,000 --> 00:00:04,000\nsecond\n", None),
+    'whitespace_first_text_line': (
+        "1\n00:00:01,000 --> 00:00:02,000\n  \nfirst\n\n2\n00:00:03,000 --> 00:00:04,000\nsecond\n", None),
+    'whitespace_only_cue': (
+        "1\n00:00:01,000 --> 00:00:02,000\n \t \n\n2\n00:00:03,000 --> 00:00:04,000\nsecond\n", None),
+    'crlf_bom_no_final_newline': (
+        "\ufeff1\r\n00:00:01,000 --> 00:00:02,000\r\nfirst  line\r\nsecond line\r\n\r\n"
+        "2\r\n00:00:03,000 --> 00:00:04,000\r\nlast", None),
+    'extra_blank_lines': (
+        "\n\n1\n00:00:01,000 --> 00:00:02,000\nfirst\n\n\n\n2\n00:00:03,000 --> 00:00:04,000\nsecond\n\n", None),
+    # The legacy regex lets an empty cue swallow the next cue's index and timing line
+    # into its text; the streaming parser skips the empty cue instead.
+    'empty_cue': (
+        "1\n00:00:01,000 --> 00:00:02,000\n\n2\n00:00:03,000 --> 00:00:04,000\nsecond\n\n"
+        "3\n00:00:05,000 --> 00:00:06,000\nthird\n", [(2, 'second'), (3, 'third')]),
+}
+
+
+def check_srt_edge_cases(tmp):
+    for name, (content, expected) in SRT_EDGE_CASES.items():
+        path = os.path.join(tmp, f"{name}.srt")
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+        actual = [(seg.index, seg.text) for seg in iter_srt_segments(path)]
+        if expected is None:
+            expected = [(s['index'], s['text']) for s in parse_srt_file(path)]
+        if actual != expected:
+            raise SystemExit(f"SRT edge case {name}: streaming parser gave {actual}, expected {expected}")
+    print(f"SRT edge cases: {len(SRT_EDGE_CASES)} files match")
+
+
+def compare(label, path, legacy, streaming):
+    legacy_result, legacy_time, legacy_peak = measure(lambda: legacy(path))
+    # Consume the generator without keeping the records, as a streaming caller would
+    count_result, stream_time, stream_peak = measure(lambda: sum(1 for _ in streaming(path)))
+
+    expected = [(s['index'], s['start_ms'], s['end_ms'], s['text']) for s in legacy_result]
+    actual = [tuple(seg) for seg in streaming(path)]
+    if expected != actual:
+        raise SystemExit(f"{label}: streaming parser output differs from legacy parser")
+
+    print(f"{label}: {count_result} cues")
+    print(f"  legacy    {legacy_time * 1000:9.1f} ms   peak {legacy_peak / 1048576:8.2f} MiB")
+    print(f"  streaming {stream_time * 1000:9.1f} ms   peak {stream_peak / 1048576:8.2f} MiB")
+    print(f"  speedup   {legacy_time / stream_time:9.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark subtitle parsers")
+    parser.add_argument("--cues", type=int, default=100000, help="Number of synthetic cues per file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        check_srt_edge_cases(tmp)
+
+        srt_path = os.path.join(tmp, "bench.srt")
+        lrc_path = os.path.join(tmp, "bench.lrc")
+        write_srt(srt_path, args.cues)
+        write_lrc(lrc_path, args.cues)
+
+        compare("SRT", srt_path, parse_srt_file, iter_srt_segments)
+        compare("LRC", lrc_path, parse_lrc_file, iter_lrc_segments)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+Stage-level benchmark for the audio-segmenter pipeline.
+
+Generates a synthetic video (lavfi sine tone + test pattern) and matching SRT/LRC
+files, then times every stage in isolation -- parse, probe, decode, slice, encode --
+plus end-to-end SegmentProcessor runs for each engine. Each measurement runs in a
+fresh process so peak RSS is attributable to that stage alone. Results are printed
+(or written) as JSON so runs can be diffed to catch regressions.
+
+Usage (from the audio-segmenter directory):
+    python benchmarks/bench_pipeline.py --duration 600 --cues 300 --json results.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+import tracemalloc
+import multiprocessing
+import queue as queue_module
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import make_media, write_lrc, write_srt  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# ==========================================
+# Stages (module-level so they can run in a spawned process)
+# ==========================================
+
+def stage_parse(ctx):
+    from core.subtitle_parser import iter_segments
+    return {'cues': sum(1 for _ in iter_segments(ctx['subtitle']))}
+
+
+def stage_probe(ctx):
+    from core.media import probe_audio
+    return probe_audio(ctx['video'])
+
+
+def stage_decode(ctx):
+    from core.media import decode_pcm
+    raw_path = os.path.join(ctx['workdir'], "bench.pcm") if ctx['storage'] == "mmap" else None
+    buffer = decode_pcm(ctx['video'], raw_path=raw_path)
+    result = {'bytes': len(buffer.data), 'duration_ms': len(buffer)}
+    buffer.close()
+    return result
+
+
+def stage_slice(ctx):
+    from core.media import decode_pcm
+    from core.subtitle_parser import iter_segments
+    raw_path = os.path.join(ctx['workdir'], "bench.pcm") if ctx['storage'] == "mmap" else None
+    buffer = decode_pcm(ctx['video'], raw_path=raw_path)
+    segments = list(iter_segments(ctx['subtitle']))
+
+    # Only the slicing itself is timed; the decode above is covered by stage_decode
+    started = time.perf_counter()
+    sliced = 0
+    for seg in segments:
+        sliced += len(bytes(buffer[seg.start_ms:seg.end_ms]))
+    elapsed = time.perf_counter() - started
+    buffer.close()
+    return {'bytes': sliced, 'clips': len(segments), 'timed_seconds': elapsed}
+
+
+def stage_encode(ctx):
+    from core.encoders import encode_clip
+    # One second of 16-bit stereo silence at 44.1kHz, encoded ctx['clips'] times
+    raw = bytes(44100 * 2 * 2)
+    for _ in range(ctx['clips']):
+        encode_clip(raw, 44100, 2, ctx['format'])
+    return {'clips': ctx['clips'], 'format': ctx['format']}
+
+
+def stage_run(ctx):
+    from core.processor import SegmentProcessor
+    out_dir = os.path.join(ctx['workdir'], f"run_{ctx['engine']}_{ctx['format']}")
+    shutil.rmtree(out_dir, ignore_errors=True)
+    SegmentProcessor(ctx['video'], ctx['subtitle'], out_dir, engine=ctx['engine'],
+                     output_format=ctx['format'], storage=ctx['storage'], workers=ctx['workers']).run()
+    return {'clips': len(os.listdir(os.path.join(out_dir, "audio_segments")))}
+
+
+def _measure_in_child(stage, ctx, queue, trace):
+    # Wall time and Python heap come from separate runs: tracemalloc slows allocation
+    # heavily and would inflate exactly the Python-bound stages (parse, slice, run)
+    try:
+        if trace:
+            tracemalloc.start()
+        started = time.perf_counter()
+        detail = stage(ctx)
+        elapsed = time.perf_counter() - started
+        py_peak = None
+        if trace:
+            _, py_peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    except BaseException as e:
+        # Report instead of dying silently, so the parent never waits for a sample
+        queue.put({'error': f"{type(e).__name__}: {e}"})
+        raise
+
+    peak_rss = None
+    if resource is not None:
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform != "darwin":
+            peak_rss *= 1024  # Linux reports KiB, macOS bytes
+    queue.put({
+        'seconds': detail.pop('timed_seconds', elapsed),
+        'peak_rss_bytes': peak_rss,
+        'peak_python_heap_bytes': py_peak,
+        'detail': detail,
+    })
+
+
+def _wait_for_sample(proc, queue):
+    """Waits for the child's record; fails if the child exits (e.g. killed) without one."""
+    while True:
+        try:
+            return queue.get(timeout=1)
+        except queue_module.Empty:
+            if not proc.is_alive():
+                # One last look: the record may have arrived just before the exit
+                try:
+                    return queue.get(timeout=1)
+                except queue_module.Empty:
+                    return {'error': f"exited with code {proc.exitcode} without reporting"}
+
+
+def _run_child(stage, ctx, trace):
+    mp_ctx = multiprocessing.get_context("spawn")
+    queue = mp_ctx.Queue()
+    proc = mp_ctx.Process(target=_measure_in_child, args=(stage, ctx, queue, trace))
+    proc.start()
+    sample = _wait_for_sample(proc, queue)
+    proc.join()
+    if 'error' in sample:
+        raise RuntimeError(f"Stage {stage.__name__} failed: {sample['error']}")
+    if proc.exitcode != 0:
+        raise RuntimeError(f"Stage {stage.__name__} failed with exit code {proc.exitcode}")
+    return sample
+
+
+def measure(stage, ctx, repeat):
+    """
+    Runs *stage* *repeat* times untraced, each in a fresh spawned process, for time and
+    peak RSS, plus one more process under tracemalloc for the Python heap peak.
+    """
+    samples = [_run_child(stage, ctx, trace=False) for _ in range(repeat)]
+    py_peak = _run_child(stage, ctx, trace=True)['peak_python_heap_bytes']
+
+    seconds = [s['seconds'] for s in samples]
+    rss = [s['peak_rss_bytes'] for s in samples if s['peak_rss_bytes'] is not None]
+    return {
+        'seconds_min': min(seconds),
+        'seconds_median': statistics.median(seconds),
+        'peak_rss_bytes': max(rss) if rss else None,
+        'peak_python_heap_bytes': py_peak,
+        'detail': samples[-1]['detail'],
+    }
+
+
+def _ffmpeg_version():
+    from core.media import ffmpeg_binary
+    try:
+        output = subprocess.run([ffmpeg_binary(), "-version"], stdout=subprocess.PIPE, check=True).stdout
+        return output.decode('utf-8', errors='replace').splitlines()[0]
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark audio-segmenter pipeline stages")
+    parser.add_argument("--duration", type=int, default=300, help="Synthetic media duration in seconds")
+    parser.add_argument("--cues", type=int, default=150, help="Number of subtitle cues")
+    parser.add_argument("--subtitle-format", choices=["srt", "lrc"], default="srt")
+    parser.add_argument("--formats", default="wav,mp3", help="Comma-separated clip formats to benchmark")
+    parser.add_argument("--engines", default="full,seek", help="Comma-separated engines for end-to-end runs")
+    parser.add_argument("--storage", choices=["memory", "mmap"], default="memory")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--encode-clips", type=int, default=20, help="Clips encoded by the isolated encode stage")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage; min and median are reported")
+    parser.add_argument("--json", help="Write results to this file instead of stdout")
+    parser.add_argument("--keep", help="Generate inputs into (and keep) this directory")
+    args = parser.parse_args()
+
+    workdir = args.keep or tempfile.mkdtemp(prefix="segmenter-bench-")
+    os.makedirs(workdir, exist_ok=True)
+    try:
+        video = os.path.join(workdir, "bench.mp4")
+        subtitle = os.path.join(workdir, f"bench.{args.subtitle_format}")
+
+        from core.media import ffmpeg_binary
+        if not os.path.exists(video):
+            make_media(video, args.duration, ffmpeg=ffmpeg_binary())
+        writer = write_lrc if args.subtitle_format == "lrc" else write_srt
+        writer(subtitle, args.cues, args.duration * 1000)
+
+        base = {'video': video, 'subtitle': subtitle, 'workdir': workdir, 'storage': args.storage,
+                'workers': args.workers, 'clips': args.encode_clips}
+        formats = [f for f in args.formats.split(",") if f]
+        engines = [e for e in args.engines.split(",") if e]
+
+        stages = {
+            'parse': measure(stage_parse, base, args.repeat),
+            'probe': measure(stage_probe, base, args.repeat),
+            'decode': measure(stage_decode, base, args.repeat),
+            'slice': measure(stage_slice, base, args.repeat),
+        }
+        for fmt in formats:
+            stages[f'encode_{fmt}'] = measure(stage_encode, dict(base, format=fmt), args.repeat)
+            for engine in engines:
+                stages[f'run_{engine}_{fmt}'] = measure(stage_run, dict(base, engine=engine, format=fmt), args.repeat)
+
+        results = {
+            'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'ffmpeg': _ffmpeg_version(),
+            'config': {k: v for k, v in vars(args).items() if k not in ("json", "keep")},
+            'stages': stages,
+        }
+        output = json.dumps(results, indent=2)
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                f.write(output + "\n")
+            print(f"Results written to {args.json}")
+        else:
+            print(output)
+    finally:
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
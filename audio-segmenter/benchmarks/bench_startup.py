@@ -0,0 +1,124 @@
+"""
+Startup / import-time benchmark for the audio-segmenter entry points.
+
+Every scenario is run in a fresh interpreter with ``-X importtime``; the per-module
+import times reported on stderr are summed, and the wall time of the whole process
+is measured too. The CLI is launched thousands of times from batch scripts, so
+``main_cli.py --help`` and an argument error must return without loading the
+processing stack: the run fails (exit code 1) if a scenario exceeds its import-time
+budget or imports a module on its forbidden list.
+
+Usage (from the audio-segmenter directory):
+    python benchmarks/bench_startup.py --repeat 10 --budget-ms 40 --json startup.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must not be imported just to parse arguments
+HEAVY_MODULES = (
+    "numpy", "pyarrow", "tkinter", "multiprocessing", "concurrent.futures.process",
+    "core.processor", "core.media", "core.batch",
+)
+
+# name: (command arguments after "python -X importtime", modules that must stay unloaded)
+SCENARIOS = {
+    'cli_help': (["main_cli.py", "--help"], HEAVY_MODULES),
+    'cli_bad_path': (["main_cli.py", "--video", "missing.mp4", "--subtitle", "missing.srt"], HEAVY_MODULES),
+    'import_processor': (["-c", "import core.processor"], ("numpy", "pyarrow", "tkinter")),
+    'import_gui': (["-c", "import gui.ui"], ("numpy", "pyarrow", "core.processor")),
+}
+
+
+def parse_importtime(stderr):
+    """Returns {module: self_microseconds} from -X importtime output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = modules.get(name.strip(), 0) + int(self_us)
+    return modules
+
+
+def run_once(arguments):
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime"] + arguments, cwd=ROOT,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True)
+    return time.perf_counter() - started, parse_importtime(proc.stderr)
+
+
+def measure(arguments, repeat):
+    walls, imports, modules = [], [], {}
+    for _ in range(repeat):
+        wall, modules = run_once(arguments)
+        walls.append(wall)
+        imports.append(sum(modules.values()))
+    slowest = sorted(modules.items(), key=lambda item: item[1], reverse=True)[:10]
+    return {
+        'wall_ms_median': statistics.median(walls) * 1000,
+        'import_ms_median': statistics.median(imports) / 1000,
+        'import_ms_min': min(imports) / 1000,
+        'modules': len(modules),
+        'slowest_modules_ms': {name: us / 1000 for name, us in slowest},
+        'loaded': modules,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark audio-segmenter startup and import time")
+    parser.add_argument("--repeat", type=int, default=5, help="Interpreter launches per scenario")
+    parser.add_argument("--budget-ms", type=float, default=50.0,
+                        help="Maximum median import time of the cli_* scenarios in milliseconds")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenarios to run")
+    parser.add_argument("--json", help="Write results to this file instead of stdout")
+    args = parser.parse_args()
+
+    results, failures = {}, []
+    for name in [s for s in args.scenarios.split(",") if s]:
+        arguments, forbidden = SCENARIOS[name]
+        if name == "import_gui":
+            try:
+                import tkinter  # noqa: F401
+            except ImportError:
+                results[name] = {'skipped': "tkinter not available"}
+                continue
+        result = measure(arguments, args.repeat)
+        loaded = result.pop('loaded')
+
+        result['forbidden_loaded'] = sorted(m for m in forbidden if m in loaded)
+        if result['forbidden_loaded']:
+            failures.append(f"{name} imports {', '.join(result['forbidden_loaded'])}")
+        if name.startswith("cli_") and result['import_ms_median'] > args.budget_ms:
+            failures.append(f"{name} import time {result['import_ms_median']:.1f} ms > budget {args.budget_ms} ms")
+        results[name] = result
+
+    output = json.dumps({
+        'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'budget_ms': args.budget_ms,
+        'scenarios': results,
+        'failures': failures,
+    }, indent=2)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            f.write(output + "\n")
+        print(f"Results written to {args.json}")
+    else:
+        print(output)
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
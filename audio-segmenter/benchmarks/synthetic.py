@@ -0,0 +1,51 @@
+"""Synthetic inputs shared by the benchmark scripts: subtitle files and lavfi-generated media."""
+import subprocess
+
+
+def _fmt_srt(ms):
+    return f"{ms // 3600000:02d}:{ms // 60000 % 60:02d}:{ms // 1000 % 60:02d},{ms % 1000:03d}"
+
+
+def _fmt_lrc(ms):
+    return f"[{ms // 60000:02d}:{ms // 1000 % 60:02d}.{ms % 1000 // 10:02d}]"
+
+
+def _cue_windows(cues, duration_ms):
+    # Evenly spaced cues that each cover 90% of their slot
+    step = max(duration_ms // max(cues, 1), 10)
+    for i in range(cues):
+        start = i * step
+        yield i, start, start + step * 9 // 10
+
+
+def write_srt(path, cues, duration_ms=None):
+    duration_ms = duration_ms or cues * 2000
+    with open(path, 'w', encoding='utf-8') as f:
+        for i, start, end in _cue_windows(cues, duration_ms):
+            f.write(f"{i + 1}\n{_fmt_srt(start)} --> {_fmt_srt(end)}\n")
+            f.write(f"Synthetic cue number {i} with some words\nand a second line\n\n")
+
+
+def write_lrc(path, cues, duration_ms=None):
+    duration_ms = duration_ms or cues * 2000
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("[ar:Benchmark]\n[ti:Synthetic]\n")
+        for i, start, _ in _cue_windows(cues, duration_ms):
+            f.write(f"{_fmt_lrc(start)}Synthetic lyric line number {i}\n")
+
+
+def make_media(path, duration_s, with_video=True, sample_rate=44100, channels=2, ffmpeg="ffmpeg"):
+    """Renders a tone (plus a small test pattern when *with_video*) using ffmpeg's lavfi sources."""
+    layout = "stereo" if channels == 2 else "mono"
+    cmd = [
+        ffmpeg, "-hide_banner", "-loglevel", "error", "-nostdin", "-y",
+        "-f", "lavfi", "-i", f"sine=frequency=440:sample_rate={sample_rate}:duration={duration_s}",
+    ]
+    if with_video:
+        cmd += ["-f", "lavfi", "-i", f"testsrc=size=160x120:rate=5:duration={duration_s}"]
+    cmd += ["-af", f"aformat=channel_layouts={layout}"]
+    if with_video:
+        cmd += ["-c:v", "mpeg4", "-q:v", "10"]
+    cmd += ["-c:a", "aac", "-shortest", path]
+    subprocess.run(cmd, check=True)
+    return path
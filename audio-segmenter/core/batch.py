@@ -0,0 +1,179 @@
+import os
+import csv
+import json
+import time
+import shutil
+from collections import namedtuple
+
+VIDEO_EXTENSIONS = ('.mp4', '.mkv', '.mov', '.avi', '.webm', '.flv', '.m4a', '.mp3', '.wav')
+SUBTITLE_EXTENSIONS = ('.srt', '.lrc')
+
+BatchJob = namedtuple('BatchJob', ['name', 'video_path', 'subtitle_path', 'output_dir'])
+JobResult = namedtuple('JobResult', ['job', 'status', 'clips', 'elapsed', 'error'])
+
+
+def _unique_name(name, used):
+    candidate = name
+    counter = 2
+    while candidate in used:
+        candidate = f"{name}_{counter}"
+        counter += 1
+    used.add(candidate)
+    return candidate
+
+
+def discover_jobs(directory, output_root):
+    """
+    Pairs every video in *directory* with the subtitle that shares its basename.
+    "talk.mp4" matches "talk.srt"/"talk.lrc", and falls back to a language-tagged
+    name such as "talk.en.srt".
+    """
+    videos = {}
+    subtitles = {}
+    for entry in sorted(os.listdir(directory)):
+        path = os.path.join(directory, entry)
+        if not os.path.isfile(path):
+            continue
+        stem, ext = os.path.splitext(entry)
+        ext = ext.lower()
+        if ext in VIDEO_EXTENSIONS:
+            videos[stem] = path
+        elif ext in SUBTITLE_EXTENSIONS:
+            subtitles.setdefault(stem, path)
+            subtitles.setdefault(os.path.splitext(stem)[0], path)
+
+    jobs = []
+    used = set()
+    for stem, video_path in videos.items():
+        subtitle_path = subtitles.get(stem)
+        if subtitle_path:
+            name = _unique_name(stem, used)
+            jobs.append(BatchJob(name, video_path, subtitle_path, os.path.join(output_root, name)))
+    return jobs
+
+
+def load_job_manifest(manifest_path, output_root):
+    """
+    Reads a CSV (with a header row) or JSONL job manifest.
+    Each record needs "video" and "subtitle" keys and may carry an optional "name".
+    Relative paths are resolved against the manifest's own directory.
+    """
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+
+    if manifest_path.lower().endswith('.csv'):
+        with open(manifest_path, 'r', newline='', encoding='utf-8-sig') as f:
+            records = list(csv.DictReader(f))
+    else:
+        records = []
+        with open(manifest_path, 'r', encoding='utf-8-sig') as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError as e:
+                    raise ValueError(f"Invalid JSON on line {line_no} of {manifest_path}") from e
+
+    jobs = []
+    used = set()
+    for number, record in enumerate(records, 1):
+        video = (record.get('video') or '').strip()
+        subtitle = (record.get('subtitle') or '').strip()
+        if not video or not subtitle:
+            raise ValueError(f"Job {number} in {manifest_path} needs both 'video' and 'subtitle'")
+        video_path = os.path.join(base_dir, video)
+        subtitle_path = os.path.join(base_dir, subtitle)
+        name = (record.get('name') or '').strip() or os.path.splitext(os.path.basename(video))[0]
+        name = _unique_name(name, used)
+        jobs.append(BatchJob(name, video_path, subtitle_path, os.path.join(output_root, name)))
+    return jobs
+
+
+def load_jobs(source, output_root):
+    """Builds the job list from a directory, a .csv manifest or a .jsonl manifest."""
+    if os.path.isdir(source):
+        return discover_jobs(source, output_root)
+    if os.path.isfile(source):
+        return load_job_manifest(source, output_root)
+    raise FileNotFoundError(f"Batch source not found: {source}")
+
+
+def _count_rows(csv_path):
+    with open(csv_path, 'r', newline='', encoding='utf-8-sig') as f:
+        return max(sum(1 for _ in csv.reader(f)) - 1, 0)
+
+
+def _run_job(job, processor_options):
+    """Runs one job inside a pool worker; the media stack is imported once per worker."""
+    from .processor import SegmentProcessor
+
+    started = time.perf_counter()
+    try:
+        processor = SegmentProcessor(job.video_path, job.subtitle_path, job.output_dir, **processor_options)
+        processor.run()
+    except Exception as e:
+        return JobResult(job, "failed", 0, time.perf_counter() - started, str(e))
+
+    elapsed = time.perf_counter() - started
+    if processor.metadata is None:
+        return JobResult(job, "empty", 0, elapsed, "No valid segments found in subtitle file.")
+    if os.path.exists(processor.csv_path):
+        return JobResult(job, "ok", _count_rows(processor.csv_path), elapsed, "")
+    return JobResult(job, "ok", processor.metadata.rows_written, elapsed, "")
+
+
+def write_combined_metadata(results, csv_path):
+    """Merges the per-job metadata files into one CSV with an extra source column."""
+    with open(csv_path, 'w', newline='', encoding='utf-8-sig') as out:
+        writer = csv.writer(out)
+        writer.writerow(['Transcript Text', 'Absolute Audio Path', 'Hashed Filename', 'Source'])
+        for result in results:
+            if result.status != "ok":
+                continue
+            job_csv = os.path.join(result.job.output_dir, "metadata.csv")
+            source = os.path.abspath(result.job.video_path)
+            with open(job_csv, 'r', newline='', encoding='utf-8-sig') as f:
+                reader = csv.reader(f)
+                next(reader, None)
+                for row in reader:
+                    writer.writerow(row + [source])
+
+
+def write_combined_jsonl(results, jsonl_path):
+    """Concatenates the per-job metadata.jsonl files (their records already carry the source)."""
+    with open(jsonl_path, 'w', encoding='utf-8') as out:
+        for result in results:
+            job_jsonl = os.path.join(result.job.output_dir, "metadata.jsonl")
+            if result.status == "ok" and os.path.exists(job_jsonl):
+                with open(job_jsonl, 'r', encoding='utf-8') as f:
+                    shutil.copyfileobj(f, out)
+
+
+def run_batch(jobs, output_root, parallel_jobs=None, processor_options=None, status_callback=None):
+    """
+    Runs every job on a process pool and writes <output_root>/metadata.csv.
+    Returns the JobResult list in the original job order.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    processor_options = dict(processor_options or {})
+    parallel_jobs = parallel_jobs or os.cpu_count() or 1
+    os.makedirs(output_root, exist_ok=True)
+
+    results = [None] * len(jobs)
+    with ProcessPoolExecutor(max_workers=min(parallel_jobs, len(jobs)) or 1) as pool:
+        futures = {pool.submit(_run_job, job, processor_options): i for i, job in enumerate(jobs)}
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            results[futures[future]] = result
+            if status_callback:
+                status_callback(f"[{done}/{len(jobs)}] {result.job.name}: {result.status} "
+                                f"({result.clips} clips, {result.elapsed:.1f}s)")
+
+    metadata_formats = processor_options.get('metadata_formats', ("csv",))
+    if "csv" in metadata_formats:
+        write_combined_metadata(results, os.path.join(output_root, "metadata.csv"))
+    if "jsonl" in metadata_formats:
+        write_combined_jsonl(results, os.path.join(output_root, "metadata.jsonl"))
+    return results
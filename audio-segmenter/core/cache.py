@@ -0,0 +1,149 @@
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+
+
+def clip_key(source_fingerprint, start_ms, end_ms, settings):
+    """Cache key of one encoded clip: source content, exact cut window and encode settings."""
+    payload = json.dumps([source_fingerprint, start_ms, end_ms, settings], sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _link_or_copy(source, target):
+    try:
+        os.link(source, target)
+    except OSError:
+        # Different filesystem, or links not supported (FAT, some network shares)
+        shutil.copyfile(source, target)
+
+
+class ClipCache:
+    """
+    Content-addressed store of encoded clips shared across runs and output directories.
+
+    Entries live at "<cache_dir>/<key[:2]>/<key>.<ext>" and are hard-linked into an
+    output directory on a hit (copied when linking is not possible), so re-segmenting
+    the same source with tweaked subtitles only encodes the windows that changed.
+    Recency is the entry's mtime, refreshed on every hit; once the cache grows past
+    *max_bytes* the least recently used entries are evicted.
+
+    Several processes may share one cache directory. Writes are atomic renames and
+    eviction tolerates entries another process already removed.
+    """
+
+    def __init__(self, cache_dir, max_bytes=10 * 1024 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._entries = {}
+        self._total_bytes = 0
+        self._scan()
+
+    def _scan(self):
+        for bucket in os.scandir(self.cache_dir):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                if entry.name.startswith('.'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                self._entries[entry.path] = [stat.st_size, stat.st_mtime]
+                self._total_bytes += stat.st_size
+
+    def _path(self, key, ext):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.{ext}")
+
+    def _touch(self, path):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        if path in self._entries:
+            self._entries[path][1] = os.path.getmtime(path)
+
+    def _lookup(self, key, ext):
+        path = self._path(key, ext)
+        if os.path.exists(path):
+            self.hits += 1
+            self._touch(path)
+            return path
+        self.misses += 1
+        return None
+
+    def fetch(self, key, ext, output_path):
+        """Links (or copies) a cached clip to *output_path*. Returns False on a miss."""
+        path = self._lookup(key, ext)
+        if path is None:
+            return False
+        if os.path.lexists(output_path):
+            os.remove(output_path)
+        try:
+            _link_or_copy(path, output_path)
+        except FileNotFoundError:
+            # Evicted by another process between the lookup and the link
+            self.hits -= 1
+            self.misses += 1
+            return False
+        return True
+
+    def read(self, key, ext):
+        """Returns the cached clip bytes, or None on a miss."""
+        path = self._lookup(key, ext)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _commit(self, temp_path, key, ext):
+        path = self._path(key, ext)
+        os.replace(temp_path, path)
+        size = os.path.getsize(path)
+        previous = self._entries.get(path)
+        if previous:
+            self._total_bytes -= previous[0]
+        self._entries[path] = [size, os.path.getmtime(path)]
+        self._total_bytes += size
+        self._evict()
+
+    def _temp_path(self, key):
+        bucket = os.path.join(self.cache_dir, key[:2])
+        os.makedirs(bucket, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=".", dir=bucket)
+        os.close(fd)
+        os.remove(temp_path)
+        return temp_path
+
+    def store_file(self, key, ext, source_path):
+        """Adds an encoded clip file; it is hard-linked into the cache when possible."""
+        temp_path = self._temp_path(key)
+        _link_or_copy(source_path, temp_path)
+        self._commit(temp_path, key, ext)
+
+    def store_bytes(self, key, ext, data):
+        temp_path = self._temp_path(key)
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        self._commit(temp_path, key, ext)
+
+    def _evict(self):
+        if self._total_bytes <= self.max_bytes:
+            return
+        for path, (size, _) in sorted(self._entries.items(), key=lambda item: item[1][1]):
+            if self._total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            del self._entries[path]
+            self._total_bytes -= size
@@ -0,0 +1,101 @@
+import io
+import wave
+
+from .media import extract_clip, ffmpeg_binary, run_command
+
+# Output formats: file extension plus the ffmpeg output arguments that produce it.
+# "wav" has no ffmpeg arguments because it is written in pure Python (no subprocess).
+OUTPUT_FORMATS = {
+    "mp3": {'ext': "mp3", 'args': ["-f", "mp3"]},
+    "wav": {'ext': "wav", 'args': None},
+    "flac": {'ext': "flac", 'args': ["-c:a", "flac", "-f", "flac"]},
+    "opus": {'ext': "opus", 'args': ["-c:a", "libopus", "-f", "ogg"]},
+}
+
+# libopus only accepts these rates; anything else is resampled to 48kHz on encode
+_OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+
+
+def _check_format(fmt):
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {fmt!r}. Choose one of: {', '.join(OUTPUT_FORMATS)}")
+
+
+def format_extension(fmt):
+    _check_format(fmt)
+    return OUTPUT_FORMATS[fmt]['ext']
+
+
+def ffmpeg_output_args(fmt, sample_rate=None, channels=None):
+    """ffmpeg output options for *fmt*, optionally resampling/downmixing on the way out."""
+    _check_format(fmt)
+    args = []
+    if sample_rate:
+        if fmt == "opus" and sample_rate not in _OPUS_SAMPLE_RATES:
+            sample_rate = 48000
+        args += ["-ar", str(sample_rate)]
+    elif fmt == "opus":
+        args += ["-ar", "48000"]
+    if channels:
+        args += ["-ac", str(channels)]
+    if fmt == "wav":
+        return args + ["-c:a", "pcm_s16le", "-f", "wav"]
+    return args + OUTPUT_FORMATS[fmt]['args']
+
+
+def _write_wav(target, raw_data, frame_rate, channels):
+    with wave.open(target, 'wb') as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(frame_rate)
+        wav.writeframes(raw_data)
+
+
+def _ffmpeg_encode_command(frame_rate, channels, fmt, output):
+    cmd = [
+        ffmpeg_binary(), "-hide_banner", "-loglevel", "error", "-y",
+        "-f", "s16le", "-ar", str(frame_rate), "-ac", str(channels), "-i", "pipe:0",
+    ]
+    if fmt == "opus" and frame_rate not in _OPUS_SAMPLE_RATES:
+        cmd += ["-ar", "48000"]
+    return cmd + OUTPUT_FORMATS[fmt]['args'] + [output]
+
+
+def write_clip(raw_data, frame_rate, channels, fmt, output_path):
+    """
+    Writes one s16le PCM clip to *output_path* in *fmt*.
+    WAV is written directly with the wave module; compressed formats are encoded by
+    a single ffmpeg process fed over stdin (no temp WAV, unlike AudioSegment.export).
+    """
+    _check_format(fmt)
+    if fmt == "wav":
+        _write_wav(output_path, raw_data, frame_rate, channels)
+    else:
+        run_command(_ffmpeg_encode_command(frame_rate, channels, fmt, output_path), input_data=raw_data)
+    return output_path
+
+
+def encode_clip(raw_data, frame_rate, channels, fmt):
+    """Same as write_clip, but returns the encoded bytes instead of writing a file."""
+    _check_format(fmt)
+    if fmt == "wav":
+        buffer = io.BytesIO()
+        _write_wav(buffer, raw_data, frame_rate, channels)
+        return buffer.getvalue()
+    return run_command(_ffmpeg_encode_command(frame_rate, channels, fmt, "pipe:1"), input_data=raw_data)
+
+
+def cut_clip(media_path, start_ms, end_ms, fmt, sample_rate, channels, output_path=None):
+    """
+    Cuts one window straight from the source (seek engine) into *output_path*, or
+    returns the encoded bytes when no path is given. WAV bytes are framed in Python
+    from raw PCM, because ffmpeg cannot finalise a WAV header on a pipe.
+    """
+    if output_path is not None:
+        return extract_clip(media_path, start_ms, end_ms, output_path,
+                            ffmpeg_output_args(fmt, sample_rate, channels))
+    if fmt == "wav":
+        raw_args = ["-ar", str(sample_rate), "-ac", str(channels), "-f", "s16le", "-c:a", "pcm_s16le"]
+        raw_data = extract_clip(media_path, start_ms, end_ms, "pipe:1", raw_args)
+        return encode_clip(raw_data, sample_rate, channels, fmt)
+    return extract_clip(media_path, start_ms, end_ms, "pipe:1", ffmpeg_output_args(fmt, sample_rate, channels))
@@ -0,0 +1,42 @@
+from collections import namedtuple
+
+# One instrumentation record emitted by SegmentProcessor.
+#   kind:            "stage_start", "stage_end", "status" or "progress"
+#   stage:           "parse", "decode", "probe", "refine", "normalize", "segment" or "metadata"
+#   elapsed:         seconds since the current stage started
+#   bytes_processed: bytes of clip audio produced so far in the stage
+#   clips_per_sec / eta: throughput and estimated seconds left (progress events only)
+StageEvent = namedtuple(
+    'StageEvent',
+    ['kind', 'stage', 'message', 'percent', 'elapsed', 'bytes_processed',
+     'clips_done', 'clips_total', 'clips_per_sec', 'eta'],
+    defaults=(None, None, 0.0, 0, None, None, None, None),
+)
+
+
+def accepts_percent(callback):
+    """
+    True if *callback* can be called as callback(message, percent).
+    Decided once from the signature, so a TypeError raised inside the callback is
+    never mistaken for a calling-convention mismatch.
+    """
+    import inspect
+
+    try:
+        signature = inspect.signature(callback)
+    except (TypeError, ValueError):
+        # No introspectable signature (some builtins): assume the GUI-style (message, percent)
+        return True
+    try:
+        signature.bind("message", 0)
+        return True
+    except TypeError:
+        return False
+
+
+def format_stage_timings(timings):
+    """Renders {stage: seconds} as an aligned table with each stage's share of the total."""
+    total = sum(timings.values()) or 1.0
+    lines = [f"{stage:<10} {seconds:9.3f}s  {seconds / total * 100:5.1f}%" for stage, seconds in timings.items()]
+    lines.append(f"{'total':<10} {sum(timings.values()):9.3f}s")
+    return "\n".join(lines)
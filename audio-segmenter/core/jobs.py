@@ -0,0 +1,169 @@
+import os
+import threading
+import itertools
+from collections import namedtuple
+
+# Job lifecycle: queued -> running -> done | failed | cancelled (queued jobs may be cancelled directly)
+JOB_STATES = ("queued", "running", "done", "failed", "cancelled")
+FINISHED_STATES = ("done", "failed", "cancelled")
+
+# Immutable view of one job handed to UIs; taken under the queue lock so it is always consistent
+JobStatus = namedtuple('JobStatus', ['job_id', 'name', 'video_path', 'subtitle_path', 'output_dir', 'state',
+                                     'message', 'percent', 'clips_done', 'clips_total', 'error'])
+
+
+class _Job:
+    def __init__(self, job_id, name, video_path, subtitle_path, output_dir, options):
+        self.job_id = job_id
+        self.name = name
+        self.video_path = video_path
+        self.subtitle_path = subtitle_path
+        self.output_dir = output_dir
+        self.options = options
+        self.state = "queued"
+        self.message = "Queued"
+        self.percent = 0
+        self.clips_done = 0
+        self.clips_total = 0
+        self.error = ""
+        self.cancel_event = threading.Event()
+
+    def status(self):
+        return JobStatus(self.job_id, self.name, self.video_path, self.subtitle_path, self.output_dir,
+                         self.state, self.message, self.percent, self.clips_done, self.clips_total, self.error)
+
+
+class JobQueue:
+    """
+    Runs queued SegmentProcessor jobs on background threads, up to *max_concurrent* at once.
+
+    Workers never call back into the UI. Every status message and progress event only
+    overwrites the job's latest state and bumps a version counter, so any number of
+    per-clip updates between two UI refreshes coalesce into one. A UI polls
+    snapshot() on its own schedule (the Tk GUIs do so via root.after at a fixed frame
+    rate) and redraws only when the version changed. Jobs are cancelled through the
+    processor's cancel_event, which takes effect between stages and clips.
+    """
+
+    def __init__(self, max_concurrent=1):
+        self.max_concurrent = max(1, max_concurrent)
+        self.version = 0
+        self._jobs = []
+        self._running = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, video_path, subtitle_path, output_dir, name=None, **processor_options):
+        """Queues one video/subtitle pair and returns its job id."""
+        name = name or os.path.splitext(os.path.basename(video_path))[0]
+        with self._lock:
+            job = _Job(next(self._ids), name, video_path, subtitle_path, output_dir, processor_options)
+            self._jobs.append(job)
+            self._changed()
+        self._start_ready()
+        return job.job_id
+
+    def set_max_concurrent(self, max_concurrent):
+        with self._lock:
+            self.max_concurrent = max(1, max_concurrent)
+        self._start_ready()
+
+    def cancel(self, job_id):
+        with self._lock:
+            for job in self._jobs:
+                if job.job_id == job_id:
+                    self._cancel_job(job)
+                    break
+
+    def cancel_all(self):
+        with self._lock:
+            for job in self._jobs:
+                self._cancel_job(job)
+
+    def clear_finished(self):
+        with self._lock:
+            self._jobs = [job for job in self._jobs if job.state not in FINISHED_STATES]
+            self._changed()
+
+    def snapshot(self):
+        """Returns (version, [JobStatus, ...]) in submission order."""
+        with self._lock:
+            return self.version, [job.status() for job in self._jobs]
+
+    def is_idle(self):
+        with self._lock:
+            return all(job.state in FINISHED_STATES for job in self._jobs)
+
+    def _changed(self):
+        # Caller holds self._lock
+        self.version += 1
+
+    def _cancel_job(self, job):
+        # Caller holds self._lock
+        if job.state == "queued":
+            job.state = "cancelled"
+            job.message = "Cancelled"
+            self._changed()
+        elif job.state == "running" and not job.cancel_event.is_set():
+            job.cancel_event.set()
+            job.message = "Cancelling..."
+            self._changed()
+
+    def _start_ready(self):
+        with self._lock:
+            ready = []
+            for job in self._jobs:
+                if self._running >= self.max_concurrent:
+                    break
+                if job.state == "queued":
+                    job.state = "running"
+                    job.message = "Starting..."
+                    self._running += 1
+                    ready.append(job)
+            if ready:
+                self._changed()
+        for job in ready:
+            threading.Thread(target=self._run, args=(job,), daemon=True).start()
+
+    def _update(self, job, **fields):
+        with self._lock:
+            for key, value in fields.items():
+                setattr(job, key, value)
+            self._changed()
+
+    def _on_status(self, job, message, percent=None):
+        if percent is None:
+            self._update(job, message=message)
+        else:
+            self._update(job, message=message, percent=percent)
+
+    def _on_event(self, job, event):
+        if event.kind == "progress":
+            self._update(job, clips_done=event.clips_done, clips_total=event.clips_total)
+
+    def _run(self, job):
+        # Imported here so building a queue does not pull in the media stack
+        from .processor import SegmentationCancelled, SegmentProcessor
+
+        try:
+            processor = SegmentProcessor(
+                job.video_path, job.subtitle_path, job.output_dir,
+                status_callback=lambda message, percent=None: self._on_status(job, message, percent),
+                event_callback=lambda event: self._on_event(job, event),
+                cancel_event=job.cancel_event, **job.options)
+            processor.run()
+            if processor.metadata is None:
+                final = {'state': "failed", 'error': "No valid segments found in subtitle file."}
+            else:
+                final = {'state': "done", 'percent': 100}
+        except SegmentationCancelled:
+            final = {'state': "cancelled", 'message': "Cancelled"}
+        except Exception as e:
+            final = {'state': "failed", 'message': f"Error: {e}", 'error': str(e)}
+
+        with self._lock:
+            for key, value in final.items():
+                setattr(job, key, value)
+            self._running -= 1
+            self._changed()
+        self._start_ready()
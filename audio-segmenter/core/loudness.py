@@ -0,0 +1,79 @@
+import numpy as np
+
+# Samples squared per block while building the per-millisecond energy table (bounds memory)
+_ENERGY_BLOCK_SAMPLES = 8 * 1024 * 1024
+
+
+def _ms_frame_bounds(pcm):
+    """First frame of every millisecond bin, using the same rounding as PCMBuffer slicing."""
+    ms = np.arange(len(pcm) + 1, dtype=np.int64)
+    return np.minimum(ms * pcm.frame_rate // 1000, pcm.frame_count)
+
+
+def millisecond_stats(pcm):
+    """
+    Per-millisecond sum of squares (float64) and absolute peak (int32) of a PCMBuffer,
+    all channels included. Built block by block straight from the (possibly mapped) data.
+    """
+    samples = np.frombuffer(pcm.data, dtype='<i2')
+    bounds = _ms_frame_bounds(pcm) * pcm.channels
+    bins = len(bounds) - 1
+    energy = np.zeros(bins, dtype=np.float64)
+    peak = np.zeros(bins, dtype=np.int32)
+
+    block_bins = max(1, _ENERGY_BLOCK_SAMPLES * 1000 // max(pcm.frame_rate * pcm.channels, 1))
+    for first in range(0, bins, block_bins):
+        last = min(bins, first + block_bins)
+        block = samples[bounds[first]:bounds[last]].astype(np.float64)
+        starts = bounds[first:last] - bounds[first]
+        # Empty bins (rate < 1kHz) would make reduceat repeat the next value; they stay zero
+        filled = starts < np.append(starts[1:], len(block))
+        if len(block) and filled.any():
+            energy[first:last][filled] = np.add.reduceat(block * block, starts[filled])
+            peak[first:last][filled] = np.maximum.reduceat(np.abs(block), starts[filled]).astype(np.int32)
+    return energy, peak
+
+
+def clip_gains(pcm, windows, target_db=-20.0, peak_db=-1.0, max_gain_db=30.0):
+    """
+    Linear gain per (start_ms, end_ms) window so each clip's RMS level lands on
+    *target_db* dBFS, capped so its peak stays below *peak_db* and the boost never
+    exceeds *max_gain_db*. Clip energies come from one prefix sum over the shared
+    per-millisecond table, so the cost does not grow with the number of clips.
+    Silent windows keep a gain of 1.
+    """
+    if not windows:
+        return np.ones(0)
+    energy, peak = millisecond_stats(pcm)
+    prefix = np.concatenate(([0.0], np.cumsum(energy)))
+    bounds = _ms_frame_bounds(pcm) * pcm.channels
+
+    offset = pcm.offset_ms
+    starts = np.clip(np.array([w[0] for w in windows], dtype=np.int64) - offset, 0, len(energy))
+    ends = np.clip(np.array([w[1] for w in windows], dtype=np.int64) - offset, 0, len(energy))
+    ends = np.maximum(ends, starts)
+
+    sample_counts = bounds[ends] - bounds[starts]
+    clip_energy = prefix[ends] - prefix[starts]
+    rms = np.sqrt(np.divide(clip_energy, sample_counts, out=np.zeros(len(windows)), where=sample_counts > 0))
+
+    target_rms = 32768.0 * 10 ** (target_db / 20)
+    gains = np.divide(target_rms, rms, out=np.ones(len(windows)), where=rms > 0)
+    gains = np.minimum(gains, 10 ** (max_gain_db / 20))
+
+    # Peak ceiling; the per-window peak is a max over at most a few thousand ms bins
+    clip_peaks = np.array([peak[s:e].max() if e > s else 0 for s, e in zip(starts.tolist(), ends.tolist())])
+    ceiling = 32767.0 * 10 ** (peak_db / 20)
+    gains = np.minimum(gains, np.divide(ceiling, clip_peaks, out=np.full(len(windows), np.inf),
+                                        where=clip_peaks > 0))
+    return np.where(rms > 0, gains, 1.0)
+
+
+def apply_gain(raw_data, gain):
+    """Scales s16le PCM bytes by *gain*, saturating at the int16 range."""
+    if gain == 1.0:
+        return raw_data
+    samples = np.frombuffer(raw_data, dtype='<i2').astype(np.float32)
+    samples *= gain
+    np.clip(samples, -32768, 32767, out=samples)
+    return np.rint(samples).astype('<i2').tobytes()
@@ -0,0 +1,115 @@
+import os
+import json
+import hashlib
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# Only the head and tail of the file are hashed so fingerprinting a multi-GB video stays cheap.
+_FINGERPRINT_CHUNK = 1024 * 1024
+
+
+def file_fingerprint(path):
+    """Content fingerprint built from the file size plus an MD5 of its first and last MiB."""
+    size = os.path.getsize(path)
+    digest = hashlib.md5(str(size).encode('utf-8'))
+    with open(path, 'rb') as f:
+        digest.update(f.read(_FINGERPRINT_CHUNK))
+        if size > _FINGERPRINT_CHUNK:
+            f.seek(max(size - _FINGERPRINT_CHUNK, _FINGERPRINT_CHUNK))
+            digest.update(f.read(_FINGERPRINT_CHUNK))
+    return f"{size}-{digest.hexdigest()}"
+
+
+class SegmentManifest:
+    """
+    Records every finished clip of an output directory so an interrupted run can resume.
+
+    Clips are keyed by their hashed filename. An entry stays valid while the source video
+    fingerprint and encode settings are unchanged, the cue still has the same window and
+    text, and the file on disk still has the recorded size.
+    """
+
+    def __init__(self, output_dir, video_fingerprint, subtitle_fingerprint, settings=None):
+        self.path = os.path.join(output_dir, MANIFEST_NAME)
+        self.video_fingerprint = video_fingerprint
+        self.subtitle_fingerprint = subtitle_fingerprint
+        self.settings = settings or {}
+        self.clips = {}
+        # Set once metadata holds a row that no longer matches a clip (text changed or clip removed)
+        self.metadata_stale = False
+
+    def load(self):
+        """Loads the previous manifest, discarding it if the source or settings changed."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return self
+
+        if (data.get('version') == MANIFEST_VERSION
+                and data.get('video') == self.video_fingerprint
+                and data.get('settings') == self.settings):
+            self.clips = data.get('clips', {})
+            self.metadata_stale = data.get('metadata_stale', False)
+        return self
+
+    def save(self):
+        """Writes the manifest atomically so a crash never leaves a truncated file behind."""
+        data = {
+            'version': MANIFEST_VERSION,
+            'video': self.video_fingerprint,
+            'subtitle': self.subtitle_fingerprint,
+            'settings': self.settings,
+            'clips': self.clips,
+            'metadata_stale': self.metadata_stale,
+        }
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+    def is_valid(self, filename, seg, output_path):
+        entry = self.clips.get(filename)
+        if not entry:
+            return False
+        if (entry['start_ms'], entry['end_ms'], entry['text']) != (seg.start_ms, seg.end_ms, seg.text):
+            return False
+        try:
+            return os.path.getsize(output_path) == entry['size'] > 0
+        except OSError:
+            return False
+
+    def record(self, filename, seg, output_path, window=None):
+        # A rebuilt clip with unchanged text produces the same CSV row, so keep its flag
+        previous = self.clips.get(filename, {})
+        in_csv = previous.get('in_csv', False) and previous.get('text') == seg.text
+        if previous.get('in_csv', False) and not in_csv:
+            # Same filename, new text: the row with the old transcript is now stale
+            self.metadata_stale = True
+        self.clips[filename] = {
+            'start_ms': seg.start_ms,
+            'end_ms': seg.end_ms,
+            'text': seg.text,
+            'size': os.path.getsize(output_path),
+            'in_csv': in_csv,
+        }
+        if window is not None:
+            # The window actually cut (clamped to the source, or refined), for metadata rebuilt on resume
+            self.clips[filename]['window'] = list(window)
+
+    def prune(self, keep_filenames):
+        """Forgets every clip not in *keep_filenames*; returns the removed filenames."""
+        removed = [filename for filename in self.clips if filename not in keep_filenames]
+        for filename in removed:
+            if self.clips.pop(filename).get('in_csv', False):
+                self.metadata_stale = True
+        return removed
+
+    def in_csv(self, filename):
+        return self.clips.get(filename, {}).get('in_csv', False)
+
+    def mark_in_csv(self, filenames):
+        for filename in filenames:
+            if filename in self.clips:
+                self.clips[filename]['in_csv'] = True
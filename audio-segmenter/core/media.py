@@ -0,0 +1,152 @@
+import os
+import json
+import shutil
+import subprocess
+import tempfile
+
+from .pcm import PCMBuffer
+
+# Read ffmpeg's PCM pipe in 1 MiB chunks
+_PIPE_CHUNK = 1024 * 1024
+
+
+def ffmpeg_binary():
+    """Resolves the ffmpeg executable (honours the PyInstaller/imageio override)."""
+    override = os.environ.get("IMAGEIO_FFMPEG_EXE")
+    if override and os.path.isfile(override):
+        return override
+    return shutil.which("ffmpeg") or "ffmpeg"
+
+
+def ffprobe_binary():
+    """Resolves ffprobe, preferring the copy that sits next to ffmpeg."""
+    ffmpeg = ffmpeg_binary()
+    folder, name = os.path.split(ffmpeg)
+    if folder:
+        candidate = os.path.join(folder, name.replace("ffmpeg", "ffprobe"))
+        if os.path.isfile(candidate):
+            return candidate
+    return shutil.which("ffprobe") or "ffprobe"
+
+
+def run_command(cmd, input_data=None):
+    """Runs ffmpeg/ffprobe, optionally feeding *input_data* on stdin, and returns stdout."""
+    result = subprocess.run(cmd, input=input_data, stdin=None if input_data is not None else subprocess.DEVNULL,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        error = result.stderr.decode('utf-8', errors='replace').strip()
+        raise RuntimeError(f"{os.path.basename(cmd[0])} failed: {error}")
+    return result.stdout
+
+
+def probe_audio(media_path):
+    """Returns duration_ms, sample_rate and channels of the first audio stream."""
+    output = run_command([
+        ffprobe_binary(), "-v", "error",
+        "-select_streams", "a:0",
+        "-show_entries", "stream=sample_rate,channels:format=duration",
+        "-of", "json",
+        media_path,
+    ])
+    info = json.loads(output.decode('utf-8'))
+    streams = info.get('streams') or []
+    if not streams:
+        raise ValueError(f"No audio stream found in: {media_path}")
+    try:
+        return {
+            'duration_ms': int(float(info['format']['duration']) * 1000),
+            'sample_rate': int(streams[0]['sample_rate']),
+            'channels': int(streams[0]['channels']),
+        }
+    except (KeyError, ValueError) as e:
+        raise ValueError(f"Could not read audio properties of: {media_path}") from e
+
+
+def pcm_command(media_path, sample_rate, channels, start_ms=0, end_ms=None):
+    """
+    ffmpeg command that writes the first audio stream as raw s16le PCM to stdout.
+    A [start_ms, end_ms) span is applied as an input seek, so only that span is decoded.
+    """
+    span = []
+    if start_ms:
+        span += ["-ss", f"{start_ms / 1000:.3f}"]
+    if end_ms is not None:
+        span += ["-t", f"{(end_ms - start_ms) / 1000:.3f}"]
+    return [
+        ffmpeg_binary(), "-hide_banner", "-loglevel", "error", "-nostdin",
+        *span,
+        "-i", media_path,
+        "-map", "0:a:0", "-vn",
+        "-f", "s16le", "-acodec", "pcm_s16le",
+        "-ar", str(sample_rate), "-ac", str(channels),
+        "pipe:1",
+    ]
+
+
+def pipe_pcm(media_path, sample_rate, channels, write, start_ms=0, end_ms=None):
+    """
+    Streams decoded PCM from ffmpeg into *write* chunk by chunk, so nothing touches disk.
+    stderr goes to an anonymous temp file: a chatty ffmpeg can never fill the pipe and stall us.
+    """
+    with tempfile.TemporaryFile() as stderr:
+        proc = subprocess.Popen(pcm_command(media_path, sample_rate, channels, start_ms, end_ms),
+                                stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=stderr)
+        try:
+            while True:
+                chunk = proc.stdout.read(_PIPE_CHUNK)
+                if not chunk:
+                    break
+                write(chunk)
+        finally:
+            proc.stdout.close()
+            returncode = proc.wait()
+        if returncode != 0:
+            stderr.seek(0)
+            error = stderr.read().decode('utf-8', errors='replace').strip()
+            raise RuntimeError(f"ffmpeg failed: {error}")
+
+
+def decode_pcm(media_path, sample_rate=None, channels=None, raw_path=None, start_ms=0, end_ms=None):
+    """
+    Decodes the audio track into a PCMBuffer without any MP3/WAV intermediate.
+
+    By default the PCM is held in memory. With *raw_path* it is streamed to that raw
+    file and memory-mapped instead, so RAM use no longer grows with source length;
+    the caller must close() the buffer before deleting the file.
+    With *start_ms*/*end_ms* only that span is decoded; the buffer keeps addressing
+    it in source time.
+    """
+    if sample_rate is None or channels is None:
+        info = probe_audio(media_path)
+        sample_rate = sample_rate or info['sample_rate']
+        channels = channels or info['channels']
+
+    if raw_path is None:
+        data = bytearray()
+        pipe_pcm(media_path, sample_rate, channels, data.extend, start_ms, end_ms)
+        return PCMBuffer(data, sample_rate, channels, offset_ms=start_ms)
+
+    with open(raw_path, 'wb') as f:
+        pipe_pcm(media_path, sample_rate, channels, f.write, start_ms, end_ms)
+    return PCMBuffer.open_mapped(raw_path, sample_rate, channels, offset_ms=start_ms)
+
+
+def extract_clip(media_path, start_ms, end_ms, output_path, output_args=("-f", "mp3")):
+    """
+    Cuts [start_ms, end_ms) of the first audio stream straight from the source
+    container. The seek is placed before -i so ffmpeg jumps to the nearest
+    keyframe and only decodes the requested window. *output_args* select the
+    codec/sample rate/channels (see encoders.ffmpeg_output_args). With an
+    *output_path* of "pipe:1" the encoded bytes are returned instead.
+    """
+    cmd = [
+        ffmpeg_binary(), "-hide_banner", "-loglevel", "error", "-nostdin", "-y",
+        "-ss", f"{start_ms / 1000:.3f}",
+        "-t", f"{(end_ms - start_ms) / 1000:.3f}",
+        "-i", media_path,
+        "-map", "0:a:0", "-vn",
+        *output_args,
+        output_path,
+    ]
+    output = run_command(cmd)
+    return output if output_path == "pipe:1" else output_path
@@ -0,0 +1,137 @@
+import os
+import csv
+import json
+
+# "csv": metadata.csv with the classic three columns (text, absolute path, hashed filename).
+# "jsonl"/"parquet": one record per clip that also carries the cut window and the source.
+METADATA_FORMATS = ("csv", "jsonl", "parquet")
+
+CSV_HEADER = ['Transcript Text', 'Absolute Audio Path', 'Hashed Filename']
+RECORD_FIELDS = ['text', 'path', 'filename', 'start_ms', 'end_ms', 'duration_ms', 'source']
+
+
+def metadata_path(output_dir, fmt):
+    return os.path.join(output_dir, f"metadata.{fmt}")
+
+
+def check_metadata_formats(formats):
+    for fmt in formats:
+        if fmt not in METADATA_FORMATS:
+            raise ValueError(f"Unknown metadata format: {fmt!r}. Choose from: {', '.join(METADATA_FORMATS)}")
+
+
+class _CSVSink:
+    def __init__(self, path, append):
+        write_header = not append or not os.path.exists(path)
+        self._file = open(path, 'a' if append else 'w', newline='', encoding='utf-8-sig')
+        self._writer = csv.writer(self._file)
+        if write_header:
+            self._writer.writerow(CSV_HEADER)
+
+    def write(self, records):
+        self._writer.writerows([record['text'], record['path'], record['filename']] for record in records)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class _JSONLSink:
+    def __init__(self, path, append):
+        self._file = open(path, 'a' if append else 'w', encoding='utf-8')
+
+    def write(self, records):
+        self._file.writelines(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetSink:
+    """
+    Each flushed batch becomes one row group. Parquet is only readable once its footer
+    is written, so the file is built next to the target and renamed into place on close;
+    in append mode the existing rows are copied into it first.
+    """
+
+    def __init__(self, path, append):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet metadata needs pyarrow (pip install pyarrow).")
+        self._pa = pa
+        self._path = path
+        self._temp_path = path + ".tmp"
+        self._schema = pa.schema([
+            ('text', pa.string()), ('path', pa.string()), ('filename', pa.string()),
+            ('start_ms', pa.int64()), ('end_ms', pa.int64()), ('duration_ms', pa.int64()),
+            ('source', pa.string()),
+        ])
+        self._writer = pq.ParquetWriter(self._temp_path, self._schema)
+        if append and os.path.exists(path):
+            self._writer.write_table(pq.read_table(path, schema=self._schema))
+
+    def write(self, records):
+        columns = {name: [record[name] for record in records] for name in self._schema.names}
+        self._writer.write_table(self._pa.Table.from_pydict(columns, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+        os.replace(self._temp_path, self._path)
+
+
+_SINKS = {"csv": _CSVSink, "jsonl": _JSONLSink, "parquet": _ParquetSink}
+
+
+class MetadataWriter:
+    """
+    Streams clip metadata to every requested sink while the clips are produced.
+
+    Records are buffered and written in batches of *flush_rows* (and on every explicit
+    flush), so memory stays flat on long subtitle files and a crash only loses the
+    current batch instead of the whole run's metadata.
+    """
+
+    def __init__(self, output_dir, formats=("csv",), append=False, flush_rows=256):
+        check_metadata_formats(formats)
+        self.flush_rows = flush_rows
+        self.rows_written = 0
+        self._pending = []
+        self._sinks = []
+        try:
+            for fmt in formats:
+                self._sinks.append(_SINKS[fmt](metadata_path(output_dir, fmt), append))
+        except Exception:
+            self.close()
+            raise
+
+    def add(self, text, path, filename, start_ms, end_ms, source):
+        self._pending.append({
+            'text': text,
+            'path': path,
+            'filename': filename,
+            'start_ms': start_ms,
+            'end_ms': end_ms,
+            'duration_ms': end_ms - start_ms,
+            'source': source,
+        })
+        if len(self._pending) >= self.flush_rows:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        for sink in self._sinks:
+            sink.write(self._pending)
+        self.rows_written += len(self._pending)
+        self._pending = []
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            for sink in self._sinks:
+                sink.close()
+            self._sinks = []
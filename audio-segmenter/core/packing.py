@@ -0,0 +1,57 @@
+def pack_segments(segments, min_duration_ms=5000, max_duration_ms=15000, max_gap_ms=2000):
+    """
+    Greedily packs consecutive cues into clips of *min_duration_ms*..*max_duration_ms*.
+
+    Cues are taken in start order. A clip grows cue by cue until it reaches the minimum,
+    as long as the joined window stays within the maximum and the silence before the
+    next cue is at most *max_gap_ms*. When the next cue does not fit, the clip is closed
+    even if it is still short (it then shows up at the low end of the histogram).
+    Single cues longer than the maximum are kept whole. Packed clips keep the first
+    cue's index and join the transcripts with spaces.
+    """
+    if min_duration_ms > max_duration_ms:
+        raise ValueError("The minimum packed duration must not exceed the maximum.")
+
+    packed = []
+    current = None
+    for seg in sorted(segments, key=lambda s: (s.start_ms, s.end_ms)):
+        if seg.end_ms <= seg.start_ms:
+            continue
+        if current is not None and current.end_ms - current.start_ms < min_duration_ms:
+            fits = (seg.start_ms - current.end_ms <= max_gap_ms
+                    and max(seg.end_ms, current.end_ms) - current.start_ms <= max_duration_ms)
+            if fits:
+                text = f"{current.text} {seg.text}" if current.text and seg.text else current.text or seg.text
+                current = current._replace(end_ms=max(seg.end_ms, current.end_ms), text=text)
+                continue
+        if current is not None:
+            packed.append(current)
+        current = seg
+    if current is not None:
+        packed.append(current)
+    return packed
+
+
+def duration_histogram(durations_ms, bucket_ms=1000):
+    """Counts durations per bucket; returns [(low_ms, high_ms, count), ...] without gaps."""
+    if not durations_ms:
+        return []
+    counts = {}
+    for duration in durations_ms:
+        bucket = int(duration // bucket_ms)
+        counts[bucket] = counts.get(bucket, 0) + 1
+    return [(b * bucket_ms, (b + 1) * bucket_ms, counts.get(b, 0)) for b in range(min(counts), max(counts) + 1)]
+
+
+def format_histogram(durations_ms, bucket_ms=1000, width=40):
+    """Renders duration_histogram as a text table with bars, plus count/min/median/max/total."""
+    buckets = duration_histogram(durations_ms, bucket_ms)
+    if not buckets:
+        return "No clips."
+    peak = max(count for _, _, count in buckets)
+    lines = [f"{f'{low / 1000:.1f}-{high / 1000:.1f}s':>13} {count:6d} {'#' * round(count / peak * width)}"
+             for low, high, count in buckets]
+    ordered = sorted(durations_ms)
+    lines.append(f"{len(ordered)} clips, min {ordered[0] / 1000:.1f}s, median {ordered[len(ordered) // 2] / 1000:.1f}s, "
+                 f"max {ordered[-1] / 1000:.1f}s, total {sum(ordered) / 3600000:.2f}h")
+    return "\n".join(lines)
@@ -0,0 +1,82 @@
+import os
+import mmap
+
+
+class PCMBuffer:
+    """
+    Decoded signed 16-bit little-endian PCM, addressable in milliseconds.
+
+    Mirrors the parts of pydub.AudioSegment the processor used to rely on: len() is
+    the duration in ms and buffer[start_ms:end_ms] returns the matching frames as a
+    zero-copy memoryview.
+
+    The backing store is either an in-memory bytearray or a read-only memory map of
+    a raw PCM file (see open_mapped), in which case only the pages actually sliced
+    are ever read from disk.
+
+    A buffer holding only part of the source has *offset_ms* set to where that part
+    starts; slices are still taken in source time, and end_ms is where the data ends.
+    """
+
+    sample_width = 2
+
+    def __init__(self, data, frame_rate, channels, offset_ms=0):
+        self.data = data
+        self.offset_ms = offset_ms
+        self.frame_rate = frame_rate
+        self.channels = channels
+        self.frame_size = self.sample_width * channels
+        self._view = memoryview(data)
+        self._mmap = None
+
+    @classmethod
+    def open_mapped(cls, raw_path, frame_rate, channels, offset_ms=0):
+        """Maps a raw s16le file read-only instead of loading it into RAM."""
+        with open(raw_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return cls(b'', frame_rate, channels, offset_ms)
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = cls(mapped, frame_rate, channels, offset_ms)
+        buffer._mmap = mapped
+        return buffer
+
+    @property
+    def frame_count(self):
+        return len(self._view) // self.frame_size
+
+    def __len__(self):
+        return round(1000 * self.frame_count / self.frame_rate)
+
+    @property
+    def end_ms(self):
+        return self.offset_ms + len(self)
+
+    def _byte_offset(self, ms):
+        frame = min(max(int((ms - self.offset_ms) * self.frame_rate / 1000), 0), self.frame_count)
+        return frame * self.frame_size
+
+    def __getitem__(self, millisecond):
+        if not isinstance(millisecond, slice):
+            raise TypeError("PCMBuffer only supports millisecond slices, e.g. buffer[1000:2500]")
+        start = millisecond.start if millisecond.start is not None else self.offset_ms
+        end = millisecond.stop if millisecond.stop is not None else self.end_ms
+        return self._view[self._byte_offset(start):self._byte_offset(end)]
+
+    def release_before(self, ms):
+        """
+        Tells the kernel the mapped pages before *ms* are no longer needed, so resident
+        memory stays flat while a multi-hour file is sliced front to back.
+        No-op for in-memory buffers and on platforms without madvise.
+        """
+        if self._mmap is None or not hasattr(self._mmap, 'madvise'):
+            return
+        end = self._byte_offset(ms) // mmap.PAGESIZE * mmap.PAGESIZE
+        if end > 0:
+            self._mmap.madvise(mmap.MADV_DONTNEED, 0, end)
+
+    def close(self):
+        """Releases the memory map; slices taken earlier must not be used afterwards."""
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
@@ -1,48 +1,206 @@
 import os
-import csv
+import time
 import hashlib
-from moviepy.editor import VideoFileClip
-from pydub import AudioSegment
-from .subtitle_parser import parse_srt_file, parse_lrc_file
+from collections import deque, namedtuple
+from .cache import ClipCache, clip_key
+from .events import StageEvent, accepts_percent
+from .encoders import OUTPUT_FORMATS, cut_clip, encode_clip, format_extension, write_clip
+from .manifest import SegmentManifest, file_fingerprint
+from .media import decode_pcm, probe_audio
+from .metadata import MetadataWriter, check_metadata_formats
+from .packing import pack_segments
+from .repair import OVERLAP_MODES, repair_segments
+from .selection import CueSelection
+from .shards import SHARD_INDEX_NAME, ShardWriter
+from .subtitle_parser import iter_segments
+
+# "full": decode the whole soundtrack once into an in-memory PCM buffer, then slice it.
+# "seek": cut every subtitle window straight from the source with ffmpeg input seeking.
+ENGINES = ("full", "seek")
+
+# Where the "full" engine keeps the decoded track: "memory" (RAM), "mmap" (memory-mapped
+# raw file in the output directory) or "auto" (mmap once the PCM would exceed AUTO_MMAP_BYTES).
+STORAGE_MODES = ("memory", "mmap", "auto")
+AUTO_MMAP_BYTES = 1024 * 1024 * 1024
+
+# "files": one audio file per clip in audio_segments/.
+# "shards": clips and transcripts streamed into sequential tar shards in audio_shards/.
+OUTPUT_MODES = ("files", "shards")
+
+# Flush metadata and persist the resume manifest every N finished clips
+MANIFEST_SAVE_INTERVAL = 25
+
+
+class SegmentationCancelled(Exception):
+    """Raised inside run() once the processor's cancel_event is set."""
+
+
+# One clip export: func(*args) produces the clip, or func is None and args already holds
+# the result (clip cache hit). start_ms/end_ms are the window actually cut.
+ClipTask = namedtuple('ClipTask', ['index', 'seg', 'start_ms', 'end_ms', 'key', 'func', 'args', 'row'])
 
 
 class SegmentProcessor:
-    def __init__(self, video_path, srt_path, output_dir, status_callback=None):
+    def __init__(self, video_path, srt_path, output_dir, status_callback=None, engine="full",
+                 workers=1, resume=False, storage="memory", output_format="mp3", sample_rate=None,
+                 channels=None, output_mode="files", shard_size=512 * 1024 * 1024, event_callback=None,
+                 refine=False, refine_tolerance_ms=300, silence_db=-40.0, cache_dir=None,
+                 cache_size=10 * 1024 * 1024 * 1024, metadata_formats=("csv",), cancel_event=None,
+                 time_range=None, cue_ranges=None, match=None, exclude=None, normalize_db=None,
+                 overlaps="keep", min_cue_ms=0, coalesce_ms=0, pack_min_ms=None, pack_max_ms=None):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine: {engine!r}. Choose one of: {', '.join(ENGINES)}")
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format!r}. "
+                             f"Choose one of: {', '.join(OUTPUT_FORMATS)}")
+        if output_mode not in OUTPUT_MODES:
+            raise ValueError(f"Unknown output mode: {output_mode!r}. Choose one of: {', '.join(OUTPUT_MODES)}")
+        if resume and output_mode == "shards":
+            raise ValueError("Resuming is only supported with the 'files' output mode.")
+        if refine and engine != "full":
+            raise ValueError("Silence-aware boundary refinement needs the decoded track of the 'full' engine.")
+        check_metadata_formats(metadata_formats)
+        # Cue selection (time range in ms, cue index ranges, text regexes), applied right after parsing
+        self.selection = CueSelection(time_range, cue_ranges, match, exclude)
+        # Cue list repair before extraction: overlap handling, minimum duration, coalescing
+        self.overlaps = overlaps
+        self.min_cue_ms = min_cue_ms
+        self.coalesce_ms = coalesce_ms
+        # Packing mode: consecutive cues grouped into clips of pack_min_ms..pack_max_ms
+        self.pack_min_ms = pack_min_ms or 0
+        self.pack_max_ms = pack_max_ms
+        if pack_max_ms is not None and self.pack_min_ms > pack_max_ms:
+            raise ValueError("The minimum packed duration must not exceed the maximum.")
+        # Duration in ms of every clip cut by the last run(), for duration histograms
+        self.clip_durations = []
+        if normalize_db is not None and engine != "full":
+            raise ValueError("Loudness normalization needs the decoded track of the 'full' engine.")
+        if overlaps not in OVERLAP_MODES:
+            raise ValueError(f"Unknown overlap mode: {overlaps!r}. Choose one of: {', '.join(OVERLAP_MODES)}")
+        if storage not in STORAGE_MODES:
+            raise ValueError(f"Unknown storage mode: {storage!r}. Choose one of: {', '.join(STORAGE_MODES)}")
         self.video_path = video_path
         self.srt_path = srt_path
         self.output_dir = output_dir
         self.segments_dir = os.path.join(self.output_dir, "audio_segments")
         self.csv_path = os.path.join(self.output_dir, "metadata.csv")
         self.status_callback = status_callback
+        self._status_takes_percent = accepts_percent(status_callback) if status_callback else False
+        # Receives StageEvent records: stage boundaries, status messages and per-clip throughput
+        self.event_callback = event_callback
+        self.stage_timings = {}
+        self._stage = None
+        self._stage_started = None
+        self._stage_bytes = 0
+        self.engine = engine
+        self.storage = storage
+        self.output_format = output_format
+        # None keeps the source's sample rate / channel count
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.output_mode = output_mode
+        self.shard_size = shard_size
+        self.shards_dir = os.path.join(self.output_dir, "audio_shards")
+        self.shard_writer = None
+        self.raw_audio_path = os.path.join(self.output_dir, "temp_full.pcm")
+        # 0 or None means "one worker per CPU core"
+        self.workers = workers or os.cpu_count() or 1
+        self.resume = resume
+        self.manifest = None
+        # Optional silence-aware snapping of cue boundaries (needs NumPy)
+        self.refine = refine
+        self.refine_tolerance_ms = refine_tolerance_ms
+        self.silence_db = silence_db
+        # Optional per-clip loudness normalization to this RMS level in dBFS (needs NumPy)
+        self.normalize_db = normalize_db
+        # Optional content-addressed clip cache shared across runs and output directories
+        self.cache_dir = cache_dir
+        self.cache_size = cache_size
+        self.cache = None
+        self.source_fingerprint = None
+        self.metadata_formats = tuple(metadata_formats)
+        self.metadata = None
+        self._source = os.path.abspath(video_path)
+        # Any object with is_set() (e.g. threading.Event); checked between stages and clips
+        self.cancel_event = cancel_event
 
     def _update_status(self, message, percent=None):
         """Helper to safely trigger the callback with percentage data."""
+        self._emit("status", message=message, percent=percent)
         if self.status_callback:
-            try:
+            if self._status_takes_percent:
                 # GUI Callback handles (message, percent)
                 self.status_callback(message, percent)
-            except TypeError:
-                # CLI Callback fallback
-                if percent is not None:
-                    self.status_callback(f"{message} ({percent}%)")
-                else:
-                    self.status_callback(message)
+            elif percent is not None:
+                # Single-argument (CLI) callback
+                self.status_callback(f"{message} ({percent}%)")
+            else:
+                self.status_callback(message)
+
+    def _stage_elapsed(self):
+        return time.perf_counter() - self._stage_started if self._stage_started is not None else 0.0
+
+    def _emit(self, kind, **fields):
+        if self.event_callback:
+            self.event_callback(StageEvent(kind, self._stage, elapsed=self._stage_elapsed(),
+                                           bytes_processed=self._stage_bytes, **fields))
+
+    def _check_cancelled(self):
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise SegmentationCancelled("Segmentation cancelled.")
+
+    def _begin_stage(self, stage):
+        """Closes the running stage (recording its duration) and starts timing *stage*."""
+        self._check_cancelled()
+        self._end_stage()
+        self._stage = stage
+        self._stage_started = time.perf_counter()
+        self._stage_bytes = 0
+        self._emit("stage_start")
+
+    def _end_stage(self):
+        if self._stage is None:
+            return
+        self._emit("stage_end")
+        self.stage_timings[self._stage] = self.stage_timings.get(self._stage, 0.0) + self._stage_elapsed()
+        self._stage = None
+        self._stage_started = None
 
     def _ensure_dirs(self):
-        os.makedirs(self.segments_dir, exist_ok=True)
+        if self.output_mode == "shards":
+            os.makedirs(self.output_dir, exist_ok=True)
+        else:
+            os.makedirs(self.segments_dir, exist_ok=True)
 
-    def _extract_full_audio(self):
-        self._update_status("Extracting full audio track from video (this may take a while)...", 10)
-        temp_audio_path = os.path.join(self.output_dir, "temp_full.mp3")
+    def _extract_full_audio(self, segments_data):
+        """
+        Pipes the decoded soundtrack from ffmpeg into RAM, or into a memory-mapped raw
+        file when the storage mode asks for it, so peak memory stays flat on long sources.
+        Only the span covering *segments_data* is decoded, so cost scales with the selection.
+        """
+        self._update_status("Decoding audio track from video (this may take a while)...", 10)
 
         if not os.path.exists(self.video_path):
             raise FileNotFoundError(f"Video file path invalid: {self.video_path}")
 
         try:
-            video = VideoFileClip(self.video_path)
-            video.audio.write_audiofile(temp_audio_path, bitrate="192k", verbose=False, logger=None)
-            video.close()
-            return temp_audio_path
+            info = probe_audio(self.video_path)
+            # Resampling/downmixing happens once here, for the whole track, not per clip
+            sample_rate = self.sample_rate or info['sample_rate']
+            channels = self.channels or info['channels']
+
+            # Refinement may move boundaries outwards, so the span is padded by its tolerance
+            padding = self.refine_tolerance_ms if self.refine else 0
+            span_start = max(min(seg.start_ms for seg in segments_data) - padding, 0)
+            span_end = max(max(seg.end_ms for seg in segments_data) + padding, span_start)
+
+            # ffmpeg stops at the end of the stream, so the estimate is capped by the duration
+            span_ms = max(min(span_end, info['duration_ms']) - span_start, 0)
+            pcm_bytes = span_ms * sample_rate * channels * 2 // 1000
+            use_mmap = self.storage == "mmap" or (self.storage == "auto" and pcm_bytes > AUTO_MMAP_BYTES)
+            return decode_pcm(self.video_path, sample_rate, channels,
+                              raw_path=self.raw_audio_path if use_mmap else None,
+                              start_ms=span_start, end_ms=span_end)
         except Exception as e:
             self._update_status(f"Error during extraction: {e}")
             raise e
@@ -50,62 +208,375 @@ class SegmentProcessor:
     def _generate_filename(self, index, text_snippet):
         hash_input = f"{index}-{text_snippet}".encode('utf-8')
         filename_hash = hashlib.md5(hash_input).hexdigest()[:12]
-        return f"seg_{filename_hash}.mp3"
+        return f"seg_{filename_hash}.{format_extension(self.output_format)}"
 
-    def run(self):
-        self._ensure_dirs()
-        csv_data = []
+    def _encode_settings(self):
+        settings = {'format': self.output_format, 'sample_rate': self.sample_rate, 'channels': self.channels}
+        if self.refine:
+            settings['refine'] = [self.refine_tolerance_ms, self.silence_db]
+        if self.normalize_db is not None:
+            settings['normalize_db'] = self.normalize_db
+        return settings
 
-        self._update_status("Parsing subtitle file...", 2)
+    def _refine_segments(self, segments_data, full_audio):
+        from .refine import refine_boundaries
 
-        if self.srt_path.lower().endswith('.lrc'):
-            segments_data = parse_lrc_file(self.srt_path)
-        else:
-            segments_data = parse_srt_file(self.srt_path)
+        self._update_status("Refining clip boundaries on silence...", 32)
+        return refine_boundaries(segments_data, full_audio, tolerance_ms=self.refine_tolerance_ms,
+                                 silence_db=self.silence_db)
 
-        total_segments = len(segments_data)
+    def _loudness_gains(self, windows, full_audio):
+        from .loudness import clip_gains
 
-        if total_segments == 0:
-            self._update_status("Error: No valid segments found in subtitle file.", 0)
-            return
+        self._update_status(f"Measuring clip loudness (target {self.normalize_db:g} dBFS)...", 33)
+        return clip_gains(full_audio, [(w.start_ms, min(w.end_ms, full_audio.end_ms)) for w in windows],
+                          target_db=self.normalize_db)
+
+    def _cache_key(self, start_ms, end_ms, sample_rate, channels):
+        # Keyed on the exact cut window, so refined and unrefined cuts never mix
+        settings = {'engine': self.engine, 'format': self.output_format,
+                    'sample_rate': sample_rate, 'channels': channels, 'normalize_db': self.normalize_db}
+        return clip_key(self.source_fingerprint, start_ms, end_ms, settings)
+
+    def _cached_task(self, i, seg, start_ms, end_ms, key, output_path):
+        """
+        A pre-resolved task (func None, the result in place of args) when the clip cache
+        already holds this encoded window; None on a miss or without a cache.
+        """
+        if self.cache is None:
+            return None
+        filename = os.path.basename(output_path)
+        ext = format_extension(self.output_format)
+        if self.output_mode == "shards":
+            cached = self.cache.read(key, ext)
+            if cached is not None:
+                return ClipTask(i, seg, start_ms, end_ms, key, None, cached, [seg.text, None, filename])
+        elif self.cache.fetch(key, ext, output_path):
+            return ClipTask(i, seg, start_ms, end_ms, key, None, output_path,
+                            [seg.text, os.path.abspath(output_path), filename])
+        return None
+
+    def _export_task(self, i, seg, start_ms, end_ms, key, func, args, output_path):
+        filename = os.path.basename(output_path)
+        if self.output_mode == "shards":
+            return ClipTask(i, seg, start_ms, end_ms, key, func, args, [seg.text, None, filename])
+        # Never rewrite in place: the old file may be hard-linked into the clip cache
+        if os.path.lexists(output_path):
+            os.remove(output_path)
+        return ClipTask(i, seg, start_ms, end_ms, key, func, args + (output_path,),
+                        [seg.text, os.path.abspath(output_path), filename])
+
+    def _clip_paths(self, seg):
+        filename = self._generate_filename(seg.index, seg.text[:10])
+        return filename, os.path.join(self.segments_dir, filename)
+
+    def _report_progress(self, done, total):
+        # Calculate progress mapping from 35% to 95%
+        current_progress = 35 + int((done / total) * 60)
+
+        if self.event_callback:
+            elapsed = self._stage_elapsed()
+            rate = done / elapsed if elapsed > 0 else None
+            self._emit("progress", percent=current_progress, clips_done=done, clips_total=total,
+                       clips_per_sec=rate, eta=(total - done) / rate if rate else None)
+
+        if done % 2 == 0 or done == total:
+            self._update_status(f"Processed {done}/{total} segments.", current_progress)
+
+    def _iter_full_track_tasks(self, segments_data):
+        """Decodes the whole soundtrack once and yields one export task per PCM slice."""
+        total_segments = len(segments_data)
 
         # 10% progress reaches here
-        temp_audio_path = self._extract_full_audio()
+        self._begin_stage("decode")
+        full_audio = self._extract_full_audio(segments_data)
+        self._stage_bytes = len(full_audio.data)
+
+        try:
+            # Cut windows may be refined; the original cues stay the identity used by the manifest
+            windows = segments_data
+            if self.refine:
+                self._begin_stage("refine")
+                windows = self._refine_segments(segments_data, full_audio)
+
+            gains = None
+            if self.normalize_db is not None:
+                from .loudness import apply_gain
+
+                self._begin_stage("normalize")
+                gains = self._loudness_gains(windows, full_audio)
 
-        self._update_status("Loading audio into memory for slicing...", 30)
-        full_audio = AudioSegment.from_file(temp_audio_path)
+            self._begin_stage("segment")
+            self._update_status(f"Starting segmentation of {total_segments} clips...", 35)
+
+            for i, (seg, window) in enumerate(zip(segments_data, windows)):
+                start_ms = window.start_ms
+                end_ms = window.end_ms
+
+                if start_ms >= end_ms or start_ms > full_audio.end_ms:
+                    continue
+
+                filename, output_path = self._clip_paths(seg)
+                end_ms = min(end_ms, full_audio.end_ms)
+                key = self._cache_key(start_ms, end_ms, full_audio.frame_rate, full_audio.channels)
+
+                cached = self._cached_task(i, seg, start_ms, end_ms, key, output_path)
+                if cached:
+                    yield cached
+                else:
+                    # Only the clip's own byte range is copied out of the (possibly mapped) buffer
+                    clip = bytes(full_audio[start_ms:end_ms])
+                    if gains is not None:
+                        clip = apply_gain(clip, float(gains[i]))
+                    func = encode_clip if self.output_mode == "shards" else write_clip
+                    args = (clip, full_audio.frame_rate, full_audio.channels, self.output_format)
+                    yield self._export_task(i, seg, start_ms, end_ms, key, func, args, output_path)
 
+                full_audio.release_before(start_ms)
+        finally:
+            full_audio.close()
+            if os.path.exists(self.raw_audio_path):
+                os.remove(self.raw_audio_path)
+
+    def _iter_seek_tasks(self, segments_data):
+        """Yields one ffmpeg cut per window, never decoding the full track."""
+        total_segments = len(segments_data)
+
+        self._begin_stage("probe")
+        self._update_status("Probing source duration...", 10)
+        info = probe_audio(self.video_path)
+        duration_ms = info['duration_ms']
+        sample_rate = self.sample_rate or info['sample_rate']
+        channels = self.channels or info['channels']
+
+        self._begin_stage("segment")
         self._update_status(f"Starting segmentation of {total_segments} clips...", 35)
 
         for i, seg in enumerate(segments_data):
-            start_ms = seg['start_ms']
-            end_ms = seg['end_ms']
-            text = seg['text']
+            start_ms = seg.start_ms
+            end_ms = seg.end_ms
 
-            if start_ms >= end_ms or start_ms > len(full_audio):
+            if start_ms >= end_ms or start_ms > duration_ms:
                 continue
 
-            clip = full_audio[start_ms:end_ms]
+            # Mirror the slice semantics of the full-track engine
+            end_ms = min(end_ms, duration_ms)
+
+            filename, output_path = self._clip_paths(seg)
+            key = self._cache_key(start_ms, end_ms, sample_rate, channels)
+
+            cached = self._cached_task(i, seg, start_ms, end_ms, key, output_path)
+            if cached:
+                yield cached
+            else:
+                args = (self.video_path, start_ms, end_ms, self.output_format, sample_rate, channels)
+                yield self._export_task(i, seg, start_ms, end_ms, key, cut_clip, args, output_path)
+
+    def _clip_done(self, task, result, done, total):
+        seg, row = task.seg, task.row
+        cached = task.func is None
+        if self.cache is not None and not cached:
+            ext = format_extension(self.output_format)
+            if self.output_mode == "shards":
+                self.cache.store_bytes(task.key, ext, result)
+            else:
+                self.cache.store_file(task.key, ext, row[1])
+
+        if self.output_mode == "shards":
+            # In shard mode the task returns the encoded bytes; the metadata points at the shard
+            row[1] = os.path.abspath(self.shard_writer.add(row[2], result, seg.text))
+            self._stage_bytes += len(result)
+        else:
+            self._stage_bytes += os.path.getsize(row[1])
+            self.manifest.record(row[2], seg, row[1], window=(task.start_ms, task.end_ms))
+
+        # A resumed clip rebuilt with unchanged text already has its row (record() kept the flag)
+        if not self.manifest.in_csv(row[2]):
+            self.metadata.add(row[0], row[1], row[2], task.start_ms, task.end_ms, self._source)
+            self.manifest.mark_in_csv([row[2]])
+        self.clip_durations.append(task.end_ms - task.start_ms)
+        if done % MANIFEST_SAVE_INTERVAL == 0:
+            self._checkpoint()
+        self._report_progress(done, total)
+
+    def _checkpoint(self):
+        # Metadata goes to disk first, so the manifest never claims rows that were not written
+        self.metadata.flush()
+        if self.output_mode == "files":
+            self.manifest.save()
+
+    def _execute_tasks(self, tasks, total_segments):
+        """
+        Runs the export tasks, streaming each clip's metadata as it completes.
+        With more than one worker the encodes are spread over a process pool; only a
+        bounded window of tasks is in flight and results are collected in submission
+        order, so progress and metadata rows never depend on which worker finishes first.
+        """
+        if self.workers <= 1:
+            for task in tasks:
+                self._check_cancelled()
+                # func is None for cache hits, whose result is already resolved
+                result = task.func(*task.args) if task.func else task.args
+                self._clip_done(task, result, task.index + 1, total_segments)
+            return
+
+        from concurrent.futures import Future, ProcessPoolExecutor
+
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            for task in tasks:
+                self._check_cancelled()
+                if task.func is None:
+                    future = Future()
+                    future.set_result(task.args)
+                else:
+                    future = pool.submit(task.func, *task.args)
+                pending.append((task, future))
+
+                if len(pending) >= self.workers * 2:
+                    self._collect(pending.popleft(), total_segments)
+
+            while pending:
+                self._collect(pending.popleft(), total_segments)
+
+    def _collect(self, entry, total_segments):
+        task, future = entry
+        self._clip_done(task, future.result(), task.index + 1, total_segments)
+
+    def _write_leftover_metadata(self, segments_data):
+        """Resume: rows for clips a previous run finished without getting their metadata written."""
+        for seg in segments_data:
+            filename, output_path = self._clip_paths(seg)
+            entry = self.manifest.clips.get(filename)
+            if entry and not self.manifest.in_csv(filename) and self.manifest.is_valid(filename, seg, output_path):
+                start_ms, end_ms = entry.get('window', (seg.start_ms, seg.end_ms))
+                self.metadata.add(seg.text, os.path.abspath(output_path), filename, start_ms, end_ms, self._source)
+                self.manifest.mark_in_csv([filename])
+
+    def _compact_metadata(self, segments_data):
+        """
+        Resume: drops clips whose cue no longer exists and, if any metadata row went stale
+        (a clip rebuilt under the same filename with new text, or removed), rewrites the
+        metadata files from the manifest so every filename has exactly one current row.
+        """
+        if not self.selection.active:
+            # With a cue selection the manifest may legitimately hold clips outside it
+            current = {self._clip_paths(seg)[0] for seg in segments_data}
+            for filename in self.manifest.prune(current):
+                try:
+                    os.remove(os.path.join(self.segments_dir, filename))
+                except FileNotFoundError:
+                    pass
+        if not self.manifest.metadata_stale:
+            return
+
+        entries = sorted(self.manifest.clips.items(), key=lambda item: (item[1]['start_ms'], item[0]))
+        writer = MetadataWriter(self.output_dir, self.metadata_formats)
+        try:
+            for filename, entry in entries:
+                if entry.get('in_csv', False):
+                    start_ms, end_ms = entry.get('window', (entry['start_ms'], entry['end_ms']))
+                    writer.add(entry['text'], os.path.abspath(os.path.join(self.segments_dir, filename)),
+                               filename, start_ms, end_ms, self._source)
+        finally:
+            writer.close()
+        self.manifest.metadata_stale = False
+        self.manifest.save()
+        self._update_status(f"Rewrote metadata with {writer.rows_written} current rows "
+                            f"(dropped rows of changed or removed cues).", 98)
+
+    def run(self):
+        self._ensure_dirs()
+        self.stage_timings = {}
+        self.clip_durations = []
 
-            filename = self._generate_filename(seg['index'], text[:10])
-            output_path = os.path.join(self.segments_dir, filename)
+        self._begin_stage("parse")
+        self._update_status("Parsing subtitle file...", 2)
+
+        segments_data = list(iter_segments(self.srt_path))
+
+        if len(segments_data) == 0:
+            self._update_status("Error: No valid segments found in subtitle file.", 0)
+            self._end_stage()
+            return
 
-            clip.export(output_path, format="mp3")
-            csv_data.append([text, os.path.abspath(output_path), filename])
+        if self.selection.active:
+            parsed = len(segments_data)
+            segments_data = self.selection.apply(segments_data)
+            self._update_status(f"Selected {len(segments_data)} of {parsed} cues.", 3)
+            if not segments_data:
+                self._update_status("Error: No cues match the selected range and filters.", 0)
+                self._end_stage()
+                return
 
-            # Calculate progress mapping from 35% to 95%
-            current_progress = 35 + int(((i + 1) / total_segments) * 60)
+        if self.overlaps != "keep" or self.min_cue_ms or self.coalesce_ms:
+            segments_data, stats = repair_segments(segments_data, self.overlaps, self.min_cue_ms, self.coalesce_ms)
+            self._update_status(f"Repaired cues: {stats['overlaps']} overlaps resolved, {stats['dropped']} dropped, "
+                                f"{stats['coalesced']} coalesced; {len(segments_data)} remain.", 4)
+            if not segments_data:
+                self._update_status("Error: No cues left after repairing the cue list.", 0)
+                self._end_stage()
+                return
 
-            if (i + 1) % 2 == 0 or (i + 1) == total_segments:
-                self._update_status(f"Processed {i + 1}/{total_segments} segments.", current_progress)
+        if self.pack_max_ms is not None:
+            cues = len(segments_data)
+            segments_data = pack_segments(segments_data, self.pack_min_ms, self.pack_max_ms)
+            self._update_status(f"Packed {cues} cues into {len(segments_data)} clips of "
+                                f"{self.pack_min_ms / 1000:g}-{self.pack_max_ms / 1000:g}s.", 4)
+
+        if not os.path.exists(self.video_path):
+            raise FileNotFoundError(f"Video file path invalid: {self.video_path}")
+
+        self.source_fingerprint = file_fingerprint(self.video_path)
+        self.manifest = SegmentManifest(self.output_dir, self.source_fingerprint,
+                                        file_fingerprint(self.srt_path), settings=self._encode_settings())
+        if self.cache_dir:
+            self.cache = ClipCache(self.cache_dir, max_bytes=self.cache_size)
+        if self.resume:
+            self.manifest.load()
+
+        # With --resume, clips whose manifest entry is still valid are reused as-is
+        pending_segments = []
+        for seg in segments_data:
+            filename, output_path = self._clip_paths(seg)
+            if not (self.resume and self.manifest.is_valid(filename, seg, output_path)):
+                pending_segments.append(seg)
+
+        reused = len(segments_data) - len(pending_segments)
+        if reused:
+            self._update_status(f"Resuming: {reused}/{len(segments_data)} clips already done.", 5)
+
+        # Metadata is streamed while clips finish; with --resume it is appended to the previous run's
+        self.metadata = MetadataWriter(self.output_dir, self.metadata_formats, append=self.resume)
+        try:
+            if self.resume:
+                self._write_leftover_metadata(segments_data)
+
+            if pending_segments:
+                if self.engine == "seek":
+                    tasks = self._iter_seek_tasks(pending_segments)
+                else:
+                    tasks = self._iter_full_track_tasks(pending_segments)
 
-        self._update_status("Writing CSV metadata file...", 98)
-        with open(self.csv_path, 'w', newline='', encoding='utf-8-sig') as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(['Transcript Text', 'Absolute Audio Path', 'Hashed Filename'])
-            writer.writerows(csv_data)
+                if self.output_mode == "shards":
+                    self.shard_writer = ShardWriter(self.shards_dir,
+                                                    os.path.join(self.output_dir, SHARD_INDEX_NAME),
+                                                    max_bytes=self.shard_size)
+                try:
+                    self._execute_tasks(tasks, len(pending_segments))
+                finally:
+                    if self.shard_writer is not None:
+                        self.shard_writer.close()
 
-        if os.path.exists(temp_audio_path):
-            os.remove(temp_audio_path)
+            self._begin_stage("metadata")
+            self._update_status("Finalizing metadata files...", 98)
+        finally:
+            self.metadata.close()
+            self.manifest.save()
+        if self.resume and self.output_mode == "files":
+            self._compact_metadata(segments_data)
+        self._end_stage()
 
-        self._update_status(f"Completed! Output saved to: {self.output_dir}", 100)
\ No newline at end of file
+        if self.cache is not None and (self.cache.hits or self.cache.misses):
+            self._update_status(f"Clip cache: {self.cache.hits} reused, {self.cache.misses} encoded.", 99)
+        self._update_status(f"Completed! Output saved to: {self.output_dir}", 100)
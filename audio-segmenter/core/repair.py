@@ -0,0 +1,60 @@
+# How overlapping cues are resolved: "keep" leaves them as parsed, "trim" ends a cue where the
+# next one starts (a cue lying entirely inside another is absorbed into it), "merge" joins both
+# into one cue spanning the two windows.
+OVERLAP_MODES = ("keep", "trim", "merge")
+
+
+def _join(first, second):
+    text = f"{first.text} {second.text}" if first.text and second.text else first.text or second.text
+    return first._replace(end_ms=max(first.end_ms, second.end_ms), text=text)
+
+
+def repair_segments(segments, overlaps="trim", min_duration_ms=0, coalesce_ms=0, max_gap_ms=1000):
+    """
+    Normalizes a parsed cue list before extraction, so no audio is cut twice.
+
+    Cues are sorted by start time, then a single pass resolves overlaps (see OVERLAP_MODES),
+    drops cues shorter than *min_duration_ms* and, with *coalesce_ms*, joins a cue into the
+    previous one while the gap between them is at most *max_gap_ms* and the joined window
+    stays within *coalesce_ms*. O(n log n) overall for the sort.
+
+    Returns (segments, stats) where stats counts 'overlaps', 'dropped' and 'coalesced'.
+    """
+    if overlaps not in OVERLAP_MODES:
+        raise ValueError(f"Unknown overlap mode: {overlaps!r}. Choose one of: {', '.join(OVERLAP_MODES)}")
+
+    stats = {'overlaps': 0, 'dropped': 0, 'coalesced': 0}
+    repaired = []
+
+    def finish(seg):
+        if seg.end_ms - seg.start_ms < max(min_duration_ms, 1):
+            stats['dropped'] += 1
+            return
+        if coalesce_ms and repaired:
+            previous = repaired[-1]
+            if (0 <= seg.start_ms - previous.end_ms <= max_gap_ms
+                    and seg.end_ms - previous.start_ms <= coalesce_ms):
+                repaired[-1] = _join(previous, seg)
+                stats['coalesced'] += 1
+                return
+        repaired.append(seg)
+
+    current = None
+    for seg in sorted(segments, key=lambda s: (s.start_ms, s.end_ms)):
+        if current is None:
+            current = seg
+            continue
+        if overlaps != "keep" and seg.start_ms < current.end_ms:
+            stats['overlaps'] += 1
+            if overlaps == "merge" or seg.start_ms <= current.start_ms or seg.end_ms < current.end_ms:
+                # A cue starting together with the current one cannot be trimmed apart, and one
+                # lying inside it is absorbed: trimming would leave the rest of the outer cue unclipped
+                current = _join(current, seg)
+                continue
+            current = current._replace(end_ms=seg.start_ms)
+        finish(current)
+        current = seg
+    if current is not None:
+        finish(current)
+
+    return repaired, stats
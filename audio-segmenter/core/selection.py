@@ -0,0 +1,89 @@
+import re
+
+
+def parse_timestamp(value):
+    """Milliseconds from "SS[.mmm]", "MM:SS[.mmm]" or "HH:MM:SS[.mmm]" (a comma also works as decimal mark)."""
+    text = str(value).strip().replace(',', '.')
+    parts = text.split(':')
+    if not text or len(parts) > 3:
+        raise ValueError(f"Invalid timestamp: {value!r}")
+    try:
+        seconds = float(parts[-1])
+        minutes = int(parts[-2]) if len(parts) > 1 else 0
+        hours = int(parts[-3]) if len(parts) > 2 else 0
+    except ValueError:
+        raise ValueError(f"Invalid timestamp: {value!r}")
+    if seconds < 0 or minutes < 0 or hours < 0:
+        raise ValueError(f"Invalid timestamp: {value!r}")
+    return int(round((hours * 3600 + minutes * 60 + seconds) * 1000))
+
+
+def parse_cue_ranges(spec):
+    """
+    Parses "1-50,80,120-" into [(1, 50), (80, 80), (120, None)].
+    Numbers are cue indices as written in the SRT (sequential for LRC), inclusive.
+    """
+    ranges = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        first, dash, last = part.partition('-')
+        try:
+            low = int(first) if first.strip() else 1
+            high = (int(last) if last.strip() else None) if dash else low
+        except ValueError:
+            raise ValueError(f"Invalid cue range: {part!r}")
+        if high is not None and high < low:
+            raise ValueError(f"Invalid cue range: {part!r}")
+        ranges.append((low, high))
+    if not ranges:
+        raise ValueError(f"Invalid cue range: {spec!r}")
+    return ranges
+
+
+class CueSelection:
+    """
+    Filters parsed segments right after parsing, so only the chosen cues are decoded and cut.
+
+    time_range: (start_ms, end_ms), either end None; keeps cues that start inside it.
+    cue_ranges: spec for parse_cue_ranges, matched against each cue's index.
+    match / exclude: regular expressions searched in the cue text (e.g. a speaker tag).
+    All given criteria must hold. Invalid specs raise ValueError up front.
+    """
+
+    def __init__(self, time_range=None, cue_ranges=None, match=None, exclude=None):
+        self.time_range = time_range
+        self.cue_ranges = parse_cue_ranges(cue_ranges) if cue_ranges else None
+        try:
+            self.match = re.compile(match) if match else None
+            self.exclude = re.compile(exclude) if exclude else None
+        except re.error as e:
+            raise ValueError(f"Invalid text filter: {e}")
+        if time_range:
+            start_ms, end_ms = time_range
+            if start_ms is not None and end_ms is not None and end_ms <= start_ms:
+                raise ValueError("The end of the time range must be after its start.")
+
+    @property
+    def active(self):
+        return bool(self.time_range or self.cue_ranges or self.match or self.exclude)
+
+    def accepts(self, seg):
+        if self.time_range:
+            start_ms, end_ms = self.time_range
+            if start_ms is not None and seg.start_ms < start_ms:
+                return False
+            if end_ms is not None and seg.start_ms >= end_ms:
+                return False
+        if self.cue_ranges and not any(low <= seg.index and (high is None or seg.index <= high)
+                                       for low, high in self.cue_ranges):
+            return False
+        if self.match and not self.match.search(seg.text):
+            return False
+        if self.exclude and self.exclude.search(seg.text):
+            return False
+        return True
+
+    def apply(self, segments):
+        return [seg for seg in segments if self.accepts(seg)] if self.active else list(segments)
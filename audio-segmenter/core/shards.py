@@ -0,0 +1,72 @@
+import os
+import io
+import csv
+import time
+import tarfile
+
+SHARD_INDEX_NAME = "shards_index.csv"
+
+
+class ShardWriter:
+    """
+    Streams clips into sequential WebDataset-style tar shards.
+
+    Each clip becomes two members sharing one key: "<key>.<ext>" with the audio and
+    "<key>.txt" with the transcript. A new shard is started once the current one
+    reaches *max_bytes*. The index written on close maps every hashed filename to its
+    shard plus the byte offset and size of the audio and text payloads inside the tar,
+    so loaders can read a clip with a single seek instead of opening a file per clip.
+    """
+
+    def __init__(self, shards_dir, index_path, max_bytes=512 * 1024 * 1024, prefix="shard"):
+        self.shards_dir = shards_dir
+        self.index_path = index_path
+        self.max_bytes = max_bytes
+        self.prefix = prefix
+        self.shard_number = -1
+        self.shard_path = None
+        self._tar = None
+        self._index = []
+        self._mtime = int(time.time())
+        os.makedirs(self.shards_dir, exist_ok=True)
+
+    def _open_next_shard(self):
+        if self._tar is not None:
+            self._tar.close()
+        self.shard_number += 1
+        self.shard_path = os.path.join(self.shards_dir, f"{self.prefix}-{self.shard_number:06d}.tar")
+        self._tar = tarfile.open(self.shard_path, 'w', format=tarfile.USTAR_FORMAT)
+
+    def _add_member(self, name, payload):
+        info = tarfile.TarInfo(name)
+        info.size = len(payload)
+        info.mtime = self._mtime
+        info.mode = 0o644
+        self._tar.addfile(info, io.BytesIO(payload))
+        # The tar offset now sits after the payload padded to whole 512-byte blocks
+        padded = -(-len(payload) // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+        return self._tar.offset - padded
+
+    def add(self, filename, audio_bytes, text):
+        """Appends one clip and returns the path of the shard it landed in."""
+        if self._tar is None or self._tar.offset >= self.max_bytes:
+            self._open_next_shard()
+
+        key = os.path.splitext(filename)[0]
+        text_bytes = text.encode('utf-8')
+        audio_offset = self._add_member(filename, audio_bytes)
+        text_offset = self._add_member(f"{key}.txt", text_bytes)
+
+        self._index.append([filename, os.path.basename(self.shard_path), audio_offset, len(audio_bytes),
+                            text_offset, len(text_bytes)])
+        return self.shard_path
+
+    def close(self):
+        if self._tar is not None:
+            self._tar.close()
+            self._tar = None
+
+        with open(self.index_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Hashed Filename', 'Shard', 'Offset', 'Size', 'Text Offset', 'Text Size'])
+            writer.writerows(self._index)
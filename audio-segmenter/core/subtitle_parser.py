@@ -1,4 +1,15 @@
 import re
+from collections import namedtuple
+
+# Compact, immutable segment record (namedtuples carry no per-instance __dict__)
+Segment = namedtuple('Segment', ['index', 'start_ms', 'end_ms', 'text'])
+
+# Precompiled patterns for the streaming parsers
+_SRT_TIMING_RE = re.compile(
+    r'(\d{2}):(\d{2}):(\d{2}),(\d{3})\s-->\s(\d{2}):(\d{2}):(\d{2}),(\d{3})'
+)
+# [MM:SS.xx] or [HH:MM:SS.xx] followed by the lyric text
+_LRC_LINE_RE = re.compile(r'\[(\d+):(\d+)(?::(\d+))?\.(\d+)\](.*)')
 
 
 def time_to_ms(time_str):
@@ -104,4 +115,124 @@ def parse_lrc_file(lrc_path):
             'end_ms': end_ms,
             'text': text
         })
-    return segments
\ No newline at end of file
+    return segments
+
+
+# ==========================================
+# Streaming parsers
+# ==========================================
+
+def _iter_text_lines(path):
+    """
+    Yields decoded lines without their line terminator, one at a time.
+    Each line is decoded on its own, so a stray non-UTF-8 byte only falls back
+    to latin-1 for that line instead of forcing a second read of the whole file.
+    """
+    with open(path, 'rb') as f:
+        first = True
+        for raw in f:
+            try:
+                line = raw.decode('utf-8')
+            except UnicodeDecodeError:
+                line = raw.decode('latin-1')
+            if first:
+                line = line.lstrip('\ufeff')
+                first = False
+            yield line.rstrip('\r\n')
+
+
+def _srt_groups_to_ms(groups):
+    h, m, s, ms = groups
+    return (int(h) * 3600000) + (int(m) * 60000) + (int(s) * 1000) + int(ms)
+
+
+def iter_srt_segments(srt_path):
+    """
+    Streams an SRT file line by line and yields Segment records.
+    Memory use is bounded by the longest cue, not the file size.
+    """
+    index = None
+    start_ms = end_ms = None
+    text_lines = []
+    expect_timing = False
+
+    for line in _iter_text_lines(srt_path):
+        stripped = line.strip()
+
+        if start_ms is not None:
+            if line:
+                # Whitespace-only lines stay part of the text, as in parse_srt_file
+                text_lines.append(line)
+                continue
+            # Only a truly empty line closes the cue
+            clean_text = ' '.join(text_lines).strip()
+            if clean_text:
+                yield Segment(index, start_ms, end_ms, clean_text)
+            start_ms = None
+            text_lines = []
+            continue
+
+        if expect_timing:
+            expect_timing = False
+            match = _SRT_TIMING_RE.match(stripped)
+            if match:
+                groups = match.groups()
+                start_ms = _srt_groups_to_ms(groups[:4])
+                end_ms = _srt_groups_to_ms(groups[4:])
+                continue
+
+        if stripped.isdigit():
+            index = int(stripped)
+            expect_timing = True
+
+    if start_ms is not None:
+        clean_text = ' '.join(text_lines).strip()
+        if clean_text:
+            yield Segment(index, start_ms, end_ms, clean_text)
+
+
+def iter_lrc_segments(lrc_path, last_duration_ms=3000):
+    """
+    Streams an LRC file and yields Segment records.
+    Consecutive lines sharing a timestamp are merged; each cue ends where the next
+    distinct timestamp starts, and the last one lasts *last_duration_ms*.
+    Only one merged cue is held in memory at a time.
+    """
+    position = 0
+    pending_start = None
+    pending_text = None
+
+    for line in _iter_text_lines(lrc_path):
+        match = _LRC_LINE_RE.match(line.strip())
+        if not match:
+            continue
+
+        first, second, third, fraction, text = match.groups()
+        if third is None:
+            hours, minutes, seconds = 0, int(first), int(second)
+        else:
+            hours, minutes, seconds = int(first), int(second), int(third)
+        start_ms = (hours * 3600000) + (minutes * 60000) + (seconds * 1000) + int(fraction.ljust(3, '0')[:3])
+        text = text.strip()
+
+        if pending_start == start_ms:
+            # Merge consecutive items with the same start time to avoid 0-duration segments
+            pending_text += ' ' + text
+            continue
+
+        if pending_start is not None and pending_text:
+            yield Segment(position, pending_start, start_ms, pending_text)
+
+        position += 1
+        pending_start = start_ms
+        pending_text = text
+
+    if pending_start is not None and pending_text:
+        yield Segment(position, pending_start, pending_start + last_duration_ms, pending_text)
+
+
+def iter_segments(subtitle_path, last_duration_ms=3000):
+    """Dispatches to the streaming SRT or LRC parser based on the file extension."""
+    if subtitle_path.lower().endswith('.lrc'):
+        return iter_lrc_segments(subtitle_path, last_duration_ms=last_duration_ms)
+    return iter_srt_segments(subtitle_path)
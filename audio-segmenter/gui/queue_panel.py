@@ -0,0 +1,92 @@
+import tkinter as tk
+from tkinter import ttk
+from core.jobs import FINISHED_STATES
+
+# The job queue is polled at this fixed rate; per-clip updates in between are coalesced
+REFRESH_FPS = 10
+
+
+class JobQueuePanel(tk.Frame):
+    """
+    Job list, overall progress bar and cancel controls for a core.jobs.JobQueue.
+
+    Worker threads never touch Tk: the panel polls queue.snapshot() with root.after
+    at REFRESH_FPS and redraws only when the queue version changed.
+    *on_job_finished(status)* is called on the Tk thread once per finished job.
+    """
+
+    def __init__(self, parent, job_queue, on_job_finished=None, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.job_queue = job_queue
+        self.on_job_finished = on_job_finished
+        self._version = None
+        self._finished = set()
+        self._build()
+        self.after(1000 // REFRESH_FPS, self._refresh)
+
+    def _build(self):
+        columns = ("job", "status", "progress", "message")
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", height=5, selectmode="extended")
+        for column, title, width in (("job", "Job", 140), ("status", "Status", 80),
+                                     ("progress", "Progress", 90), ("message", "Message", 280)):
+            self.tree.heading(column, text=title)
+            self.tree.column(column, width=width, stretch=column == "message")
+        self.tree.pack(fill=tk.BOTH, expand=True)
+
+        self.progress_var = tk.DoubleVar()
+        ttk.Progressbar(self, variable=self.progress_var, maximum=100).pack(fill=tk.X, pady=5)
+
+        self.status_label = tk.Label(self, text="Ready", anchor=tk.W)
+        self.status_label.pack(fill=tk.X)
+
+        buttons = tk.Frame(self)
+        buttons.pack(fill=tk.X, pady=(5, 0))
+        tk.Button(buttons, text="Cancel Selected", command=self._cancel_selected).pack(side=tk.LEFT)
+        tk.Button(buttons, text="Cancel All", command=self.job_queue.cancel_all).pack(side=tk.LEFT, padx=5)
+        tk.Button(buttons, text="Clear Finished", command=self.job_queue.clear_finished).pack(side=tk.LEFT)
+
+    def _cancel_selected(self):
+        for item in self.tree.selection():
+            self.job_queue.cancel(int(item))
+
+    def _refresh(self):
+        version, jobs = self.job_queue.snapshot()
+        if version != self._version:
+            self._version = version
+            self._render(jobs)
+        self.after(1000 // REFRESH_FPS, self._refresh)
+
+    def _render(self, jobs):
+        shown = set()
+        for job in jobs:
+            item = str(job.job_id)
+            shown.add(item)
+            progress = f"{job.clips_done}/{job.clips_total}" if job.clips_total else f"{job.percent:.0f}%"
+            values = (job.name, job.state, progress, job.error or job.message)
+            if self.tree.exists(item):
+                self.tree.item(item, values=values)
+            else:
+                self.tree.insert("", tk.END, iid=item, values=values)
+
+            if job.state in FINISHED_STATES and job.job_id not in self._finished:
+                self._finished.add(job.job_id)
+                if self.on_job_finished:
+                    self.on_job_finished(job)
+
+        for item in self.tree.get_children():
+            if item not in shown:
+                self.tree.delete(item)
+
+        # Overall progress across every job still listed
+        if jobs:
+            self.progress_var.set(sum(100 if job.state in FINISHED_STATES else job.percent for job in jobs)
+                                  / len(jobs))
+            running = [job for job in jobs if job.state == "running"]
+            if running:
+                self.status_label.config(text=f"Status: {running[0].name}: {running[0].message}")
+            else:
+                done = sum(1 for job in jobs if job.state == "done")
+                self.status_label.config(text=f"Status: {done}/{len(jobs)} jobs completed.")
+        else:
+            self.progress_var.set(0)
+            self.status_label.config(text="Ready")
@@ -1,19 +1,40 @@
+import os
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
-import threading
-from core.processor import SegmentProcessor
+from core.encoders import OUTPUT_FORMATS
+from core.jobs import FINISHED_STATES, JobQueue
+from core.selection import CueSelection, parse_timestamp
+from gui.queue_panel import JobQueuePanel
+
+SAMPLE_RATE_CHOICES = ("Original", "8000", "16000", "22050", "24000", "44100", "48000")
+CHANNEL_CHOICES = {"Original": None, "Mono": 1, "Stereo": 2}
+# Target RMS level in dBFS for per-clip loudness normalization
+LOUDNESS_CHOICES = ("Off", "-16", "-20", "-23", "-26")
 
 
 class AudioSegmenterApp:
     def __init__(self, root):
         self.root = root
         self.root.title("Audio Segmenter Tool")
-        self.root.geometry("700x600")
+        self.root.geometry("700x720")
         self.root.resizable(True, True)
 
         self.video_path_var = tk.StringVar()
         self.srt_path_var = tk.StringVar()
         self.output_dir_var = tk.StringVar()
+        self.format_var = tk.StringVar(value="mp3")
+        self.sample_rate_var = tk.StringVar(value="Original")
+        self.channels_var = tk.StringVar(value="Original")
+        self.parallel_var = tk.IntVar(value=1)
+        self.loudness_var = tk.StringVar(value="Off")
+        # Optional cue selection; empty fields mean "everything"
+        self.range_start_var = tk.StringVar()
+        self.range_end_var = tk.StringVar()
+        self.cues_var = tk.StringVar()
+        self.match_var = tk.StringVar()
+
+        # Shared core job engine: queued pairs run in the background, up to "Parallel jobs" at once
+        self.job_queue = JobQueue(max_concurrent=1)
 
         self._setup_ui()
 
@@ -37,23 +58,25 @@ class AudioSegmenterApp:
 
         self._create_path_selector(output_group, "Output Directory:", self.output_dir_var, self._browse_output,
                                    is_dir=True)
+        self._create_format_selector(output_group)
 
-        # Progress Section
-        progress_group = tk.LabelFrame(main_frame, text="Execution Progress", padx=10, pady=10)
-        progress_group.pack(fill=tk.X, pady=10)
-
-        self.progress_var = tk.DoubleVar()
-        self.progress_bar = ttk.Progressbar(progress_group, variable=self.progress_var, maximum=100)
-        self.progress_bar.pack(fill=tk.X, pady=5)
-
-        self.status_label = tk.Label(progress_group, text="Ready", anchor=tk.W)
-        self.status_label.pack(fill=tk.X)
+        # Selection Section
+        selection_group = tk.LabelFrame(main_frame, text="Cue Selection (optional)", padx=10, pady=10)
+        selection_group.pack(fill=tk.X, pady=5)
+        self._create_selection_fields(selection_group)
 
         # Action Button
-        self.start_btn = tk.Button(main_frame, text="▶ Start Segmentation", command=self._start_process_thread,
+        self.start_btn = tk.Button(main_frame, text="▶ Add to Queue", command=self._queue_job,
                                    bg="#4CAF50", fg="white", font=("Arial", 11, "bold"), height=2)
         self.start_btn.pack(fill=tk.X, pady=(10, 0))
 
+        # Queue & Progress Section
+        progress_group = tk.LabelFrame(main_frame, text="Job Queue", padx=10, pady=10)
+        progress_group.pack(fill=tk.BOTH, expand=True, pady=10)
+
+        self.queue_panel = JobQueuePanel(progress_group, self.job_queue, on_job_finished=self._job_finished)
+        self.queue_panel.pack(fill=tk.BOTH, expand=True)
+
     def _create_path_selector(self, parent, label_text, path_var, browse_command, is_dir=False):
         frame = tk.Frame(parent)
         frame.pack(fill=tk.X, pady=5)
@@ -68,6 +91,57 @@ class AudioSegmenterApp:
         btn = tk.Button(frame, text=btn_text, command=browse_command)
         btn.pack(side=tk.LEFT)
 
+    def _create_format_selector(self, parent):
+        frame = tk.Frame(parent)
+        frame.pack(fill=tk.X, pady=5)
+
+        tk.Label(frame, text="Audio Format:", width=25, anchor=tk.W).pack(side=tk.LEFT)
+        ttk.Combobox(frame, textvariable=self.format_var, values=list(OUTPUT_FORMATS),
+                     state="readonly", width=6).pack(side=tk.LEFT, padx=5)
+        tk.Label(frame, text="Sample Rate:").pack(side=tk.LEFT, padx=(10, 2))
+        ttk.Combobox(frame, textvariable=self.sample_rate_var, values=SAMPLE_RATE_CHOICES,
+                     state="readonly", width=8).pack(side=tk.LEFT)
+        tk.Label(frame, text="Channels:").pack(side=tk.LEFT, padx=(10, 2))
+        ttk.Combobox(frame, textvariable=self.channels_var, values=list(CHANNEL_CHOICES),
+                     state="readonly", width=8).pack(side=tk.LEFT)
+
+        frame = tk.Frame(parent)
+        frame.pack(fill=tk.X, pady=5)
+        tk.Label(frame, text="Parallel Jobs:", width=25, anchor=tk.W).pack(side=tk.LEFT)
+        tk.Spinbox(frame, from_=1, to=os.cpu_count() or 1, textvariable=self.parallel_var,
+                   width=5).pack(side=tk.LEFT, padx=5)
+        tk.Label(frame, text="Normalize (dBFS):").pack(side=tk.LEFT, padx=(10, 2))
+        ttk.Combobox(frame, textvariable=self.loudness_var, values=LOUDNESS_CHOICES,
+                     state="readonly", width=6).pack(side=tk.LEFT)
+        self.parallel_var.trace_add("write", self._set_parallel_jobs)
+
+    def _create_selection_fields(self, parent):
+        frame = tk.Frame(parent)
+        frame.pack(fill=tk.X, pady=5)
+        tk.Label(frame, text="Time Range (HH:MM:SS):", width=25, anchor=tk.W).pack(side=tk.LEFT)
+        tk.Entry(frame, textvariable=self.range_start_var, width=12).pack(side=tk.LEFT, padx=5)
+        tk.Label(frame, text="to").pack(side=tk.LEFT)
+        tk.Entry(frame, textvariable=self.range_end_var, width=12).pack(side=tk.LEFT, padx=5)
+        tk.Label(frame, text="Cues:").pack(side=tk.LEFT, padx=(10, 2))
+        tk.Entry(frame, textvariable=self.cues_var, width=14).pack(side=tk.LEFT)
+
+        frame = tk.Frame(parent)
+        frame.pack(fill=tk.X, pady=5)
+        tk.Label(frame, text="Text Filter (regex):", width=25, anchor=tk.W).pack(side=tk.LEFT)
+        tk.Entry(frame, textvariable=self.match_var).pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
+
+    def _selection_options(self):
+        """Cue selection options for SegmentProcessor; raises ValueError on invalid input."""
+        start = self.range_start_var.get().strip()
+        end = self.range_end_var.get().strip()
+        time_range = None
+        if start or end:
+            time_range = (parse_timestamp(start) if start else None, parse_timestamp(end) if end else None)
+        options = {'time_range': time_range, 'cue_ranges': self.cues_var.get().strip() or None,
+                   'match': self.match_var.get() or None}
+        CueSelection(**options)
+        return options
+
     def _browse_video(self):
         filename = filedialog.askopenfilename(title="Select Video File",
                                               filetypes=(
@@ -83,40 +157,51 @@ class AudioSegmenterApp:
         dirname = filedialog.askdirectory(title="Select Output Directory")
         if dirname: self.output_dir_var.set(dirname)
 
-    def _update_status(self, message, percent=None):
-        """Updates both the text label and the progress bar."""
-        self.status_label.config(text=f"Status: {message}")
-        if percent is not None:
-            self.progress_var.set(percent)
-        self.root.update_idletasks()
-
-    def _start_process_thread(self):
+    def _set_parallel_jobs(self, *_):
+        try:
+            self.job_queue.set_max_concurrent(self.parallel_var.get())
+        except tk.TclError:
+            pass  # Spinbox is empty or mid-edit
+
+    def _job_output_dir(self, output_root, video_path):
+        """Each job writes into <output>/<video name>/, suffixed while another active job uses it."""
+        name = os.path.splitext(os.path.basename(video_path))[0]
+        _, jobs = self.job_queue.snapshot()
+        active = {job.output_dir for job in jobs if job.state not in FINISHED_STATES}
+        output_dir = os.path.join(output_root, name)
+        counter = 2
+        while output_dir in active:
+            output_dir = os.path.join(output_root, f"{name}_{counter}")
+            counter += 1
+        return output_dir
+
+    def _queue_job(self):
         if not self.video_path_var.get() or not self.srt_path_var.get() or not self.output_dir_var.get():
             messagebox.showerror("Error", "Please select all input paths and the output directory.")
             return
 
-        # Disable button and reset progress bar when started
-        self.start_btn.config(state=tk.DISABLED)
-        self.progress_var.set(0)
-
-        processing_thread = threading.Thread(target=self._run_process_logic, daemon=True)
-        processing_thread.start()
-
-    def _run_process_logic(self):
         try:
-            processor = SegmentProcessor(
-                video_path=self.video_path_var.get(),
-                srt_path=self.srt_path_var.get(),
-                output_dir=self.output_dir_var.get(),
-                status_callback=self._update_status
-            )
-            processor.run()
-            messagebox.showinfo("Success", "Segmentation complete! Check output folder.")
-
-        except Exception as e:
-            err_msg = f"An error occurred:\n{str(e)}\n\nEnsure FFmpeg is configured properly."
-            self._update_status("Error during processing.", 0)
-            messagebox.showerror("Processing Error", err_msg)
-            print(f"GUI Error Catch: {e}")
-        finally:
-            self.start_btn.config(state=tk.NORMAL)
\ No newline at end of file
+            selection = self._selection_options()
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid cue selection: {e}")
+            return
+
+        video_path = self.video_path_var.get()
+        self.job_queue.submit(
+            video_path, self.srt_path_var.get(), self._job_output_dir(self.output_dir_var.get(), video_path),
+            output_format=self.format_var.get(),
+            sample_rate=None if self.sample_rate_var.get() == "Original" else int(self.sample_rate_var.get()),
+            channels=CHANNEL_CHOICES[self.channels_var.get()],
+            normalize_db=None if self.loudness_var.get() == "Off" else float(self.loudness_var.get()),
+            **selection
+        )
+
+    def _job_finished(self, job):
+        """Runs on the Tk thread (called from the queue panel's refresh)."""
+        if job.state == "done" and self.job_queue.is_idle():
+            messagebox.showinfo("Success", "All queued segmentation jobs are finished! Check the output folder.")
+        elif job.state == "failed":
+            print(f"GUI Error Catch: {job.error}")
+            messagebox.showerror("Processing Error",
+                                 f"An error occurred in {job.name}:\n{job.error}\n\n"
+                                 f"Ensure FFmpeg is configured properly.")
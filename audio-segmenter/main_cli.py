@@ -1,17 +1,217 @@
 import argparse
 import os
-from core.processor import SegmentProcessor
+# Only lightweight modules at the top: the processing stack is imported once a job actually
+# starts, so --help and argument errors return immediately (see benchmarks/bench_startup.py)
+from core.metadata import METADATA_FORMATS
+from core.selection import CueSelection, parse_timestamp
+
+
+def print_stage_event(event):
+    """--timings: report every finished stage as it closes."""
+    if event.kind == "stage_end":
+        print(f"[timing] {event.stage}: {event.elapsed:.2f}s, {event.bytes_processed / 1048576:.1f} MB")
+
+
+def run_instrumented(processor, args):
+    """Runs the processor under the optional cProfile / tracemalloc capture switches."""
+    profiler = None
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+    if args.trace_memory:
+        import tracemalloc
+        tracemalloc.start(25)
+
+    if profiler:
+        profiler.enable()
+    try:
+        processor.run()
+    finally:
+        if profiler:
+            profiler.disable()
+        if args.trace_memory:
+            # Snapshot before any reporting so the report itself doesn't show up in it
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        if profiler:
+            import pstats
+            profiler.dump_stats(args.profile)
+            print(f"\n--- Profile (top 20 by cumulative time, full stats in {args.profile}) ---")
+            pstats.Stats(profiler).sort_stats("cumulative").print_stats(20)
+        if args.trace_memory:
+            print(f"\n--- Python heap: peak {peak / 1048576:.1f} MB, top allocation sites ---")
+            for stat in snapshot.statistics("lineno")[:10]:
+                print(stat)
+
+    if args.histogram:
+        from core.packing import format_histogram
+        print("\n--- Clip Durations ---")
+        print(format_histogram(processor.clip_durations))
+
+    if args.timings and processor.stage_timings:
+        from core.events import format_stage_timings
+        print("\n--- Stage Timings ---")
+        print(format_stage_timings(processor.stage_timings))
+
+
+def run_batch_mode(args, processor_options):
+    from core.batch import load_jobs, run_batch
+
+    try:
+        jobs = load_jobs(args.batch, args.output)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}")
+        return
+    if not jobs:
+        print(f"Error: No video/subtitle pairs found in {args.batch}")
+        return
+
+    print(f"--- Starting Audio Segmentation (Batch Mode, {len(jobs)} jobs) ---")
+    results = run_batch(jobs, args.output, parallel_jobs=args.jobs,
+                        processor_options=processor_options, status_callback=print)
+
+    print("\n--- Batch Summary ---")
+    for result in results:
+        line = f"{result.status.upper():7} {result.job.name}: {result.clips} clips in {result.elapsed:.1f}s"
+        if result.error:
+            line += f" - {result.error}"
+        print(line)
+    succeeded = sum(1 for r in results if r.status == "ok")
+    print(f"{succeeded}/{len(results)} jobs succeeded. "
+          f"Combined metadata: {os.path.abspath(os.path.join(args.output, 'metadata.csv'))}")
 
 
 def main():
     parser = argparse.ArgumentParser(description="CLI for Audio Segmentation Tool")
-    parser.add_argument("--video", required=True, help="Path to source video file")
+    parser.add_argument("--video", help="Path to source video file")
     # Updated to reflect support for both subtitle formats
-    parser.add_argument("--subtitle", required=True, help="Path to source subtitle file (.srt or .lrc)")
+    parser.add_argument("--subtitle", help="Path to source subtitle file (.srt or .lrc)")
+    parser.add_argument("--batch",
+                        help="Directory of video/subtitle pairs (matched by basename) or a .csv/.jsonl job manifest")
     parser.add_argument("--output", default="./output", help="Directory for output files")
+    parser.add_argument("--engine", choices=["full", "seek"], default="full",
+                        help="full: decode the whole track then slice; "
+                             "seek: cut each clip straight from the video with ffmpeg (faster on long videos)")
+    parser.add_argument("--output-mode", choices=["files", "shards"], default="files",
+                        help="files: one audio file per clip; shards: pack clips + transcripts into tar shards")
+    parser.add_argument("--shard-size", type=int, default=512,
+                        help="Shard mode: start a new tar shard after this many megabytes (default: 512)")
+    parser.add_argument("--storage", choices=["memory", "mmap", "auto"], default="memory",
+                        help="Full engine only: keep decoded audio in RAM, in a memory-mapped raw file, "
+                             "or pick automatically by size")
+    parser.add_argument("--format", dest="output_format", choices=["mp3", "wav", "flac", "opus"], default="mp3",
+                        help="Clip format. wav is written in pure Python without launching ffmpeg per clip")
+    parser.add_argument("--sample-rate", type=int, default=None,
+                        help="Resample clips to this rate in Hz, e.g. 16000 (default: keep source rate)")
+    parser.add_argument("--channels", type=int, choices=[1, 2], default=None,
+                        help="Downmix/upmix clips to this channel count (default: keep source channels)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of processes used to encode clips in parallel (0 = one per CPU core)")
+    parser.add_argument("--jobs", type=int, default=0,
+                        help="Batch mode: number of video/subtitle pairs processed concurrently (0 = one per CPU core)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip clips already recorded in the output manifest and append to metadata.csv")
+    parser.add_argument("--refine", action="store_true",
+                        help="Full engine: snap clip boundaries to the nearest silence (requires numpy)")
+    parser.add_argument("--refine-tolerance", type=int, default=300,
+                        help="Refine: maximum boundary shift in milliseconds (default: 300)")
+    parser.add_argument("--silence-db", type=float, default=-40.0,
+                        help="Refine: RMS level in dBFS at or below which audio counts as silence (default: -40)")
+    parser.add_argument("--normalize", type=float, default=None, metavar="DBFS",
+                        help="Full engine: normalize every clip to this RMS level in dBFS, e.g. -20 (requires numpy)")
+    parser.add_argument("--overlaps", choices=["keep", "trim", "merge"], default="keep",
+                        help="Overlapping cues: keep as parsed, trim each cue to where the next starts, or merge them")
+    parser.add_argument("--min-cue", type=int, default=0, metavar="MS",
+                        help="Drop cues shorter than this many milliseconds (after overlap repair)")
+    parser.add_argument("--coalesce", type=int, default=0, metavar="MS",
+                        help="Join short adjacent cues (gap <= 1s) while the joined clip stays within MS milliseconds")
+    parser.add_argument("--pack-min", type=float, default=5.0, metavar="SECONDS",
+                        help="Packing: close a packed clip once it reaches this duration (default: 5)")
+    parser.add_argument("--pack-max", type=float, default=None, metavar="SECONDS",
+                        help="Enable packing: group consecutive cues into clips of at most this duration, "
+                             "with concatenated transcripts")
+    parser.add_argument("--histogram", action="store_true",
+                        help="Print a histogram of the produced clip durations")
+    parser.add_argument("--start", type=parse_timestamp, default=None,
+                        help="Only cues starting at or after this time (SS, MM:SS or HH:MM:SS[.mmm])")
+    parser.add_argument("--end", type=parse_timestamp, default=None,
+                        help="Only cues starting before this time; only the covering span is decoded")
+    parser.add_argument("--cues", default=None,
+                        help="Only these cue indices, e.g. '1-50,80,120-' (SRT numbers; LRC lines count from 1)")
+    parser.add_argument("--match", default=None,
+                        help="Only cues whose text matches this regex (e.g. a speaker tag: '^\\[Alice\\]')")
+    parser.add_argument("--exclude", default=None, help="Skip cues whose text matches this regex")
+    parser.add_argument("--metadata", default="csv",
+                        help="Comma-separated metadata outputs: csv, jsonl, parquet (requires pyarrow). Default: csv")
+    parser.add_argument("--cache", metavar="DIR",
+                        help="Content-addressed clip cache shared across runs; repeat windows are linked, not re-encoded")
+    parser.add_argument("--cache-size", type=int, default=10240,
+                        help="Clip cache size limit in MB; least recently used clips are evicted (default: 10240)")
+    parser.add_argument("--timings", action="store_true",
+                        help="Print per-stage wall time and bytes processed")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="Profile the run with cProfile and save the stats to FILE (main process only)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Track Python heap allocations with tracemalloc and report the top sites")
 
     args = parser.parse_args()
 
+    if args.batch and (args.video or args.subtitle):
+        parser.error("--batch cannot be combined with --video/--subtitle")
+    if not args.batch and not (args.video and args.subtitle):
+        parser.error("Provide --video and --subtitle, or --batch")
+    if args.workers < 0 or args.jobs < 0:
+        print("Error: --workers and --jobs must be 0 or a positive number")
+        return
+    if args.shard_size <= 0:
+        print("Error: --shard-size must be a positive number")
+        return
+    metadata_formats = [fmt.strip() for fmt in args.metadata.split(",") if fmt.strip()]
+    unknown = [fmt for fmt in metadata_formats if fmt not in METADATA_FORMATS]
+    if not metadata_formats or unknown:
+        print(f"Error: --metadata takes a comma-separated list of: {', '.join(METADATA_FORMATS)}")
+        return
+    time_range = (args.start, args.end) if args.start is not None or args.end is not None else None
+    try:
+        CueSelection(time_range, args.cues, args.match, args.exclude)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    if args.cache_size <= 0:
+        print("Error: --cache-size must be a positive number")
+        return
+    if args.pack_max is not None and not 0 <= args.pack_min <= args.pack_max:
+        print("Error: --pack-min must be between 0 and --pack-max")
+        return
+    if args.normalize is not None and args.engine != "full":
+        print("Error: --normalize requires --engine full")
+        return
+    if args.refine and args.engine != "full":
+        print("Error: --refine requires --engine full")
+        return
+    if args.resume and args.output_mode == "shards":
+        print("Error: --resume is only supported with --output-mode files")
+        return
+
+    processor_options = {'engine': args.engine, 'workers': args.workers, 'resume': args.resume,
+                         'storage': args.storage, 'output_format': args.output_format,
+                         'sample_rate': args.sample_rate, 'channels': args.channels,
+                         'output_mode': args.output_mode, 'shard_size': args.shard_size * 1024 * 1024,
+                         'refine': args.refine, 'refine_tolerance_ms': args.refine_tolerance,
+                         'silence_db': args.silence_db, 'cache_dir': args.cache,
+                         'cache_size': args.cache_size * 1024 * 1024,
+                         'metadata_formats': metadata_formats,
+                         'time_range': time_range, 'cue_ranges': args.cues, 'match': args.match,
+                         'exclude': args.exclude, 'normalize_db': args.normalize, 'overlaps': args.overlaps,
+                         'min_cue_ms': args.min_cue, 'coalesce_ms': args.coalesce,
+                         'pack_min_ms': int(args.pack_min * 1000) if args.pack_max is not None else None,
+                         'pack_max_ms': int(args.pack_max * 1000) if args.pack_max is not None else None}
+
+    if args.batch:
+        run_batch_mode(args, processor_options)
+        return
+
     if not os.path.isfile(args.video):
         print(f"Error: Video file not found at {args.video}")
         return
@@ -20,9 +220,13 @@ def main():
         return
 
     print("--- Starting Audio Segmentation (CLI Mode) ---")
+    from core.processor import SegmentProcessor
+
     try:
-        processor = SegmentProcessor(args.video, args.subtitle, args.output, status_callback=print)
-        processor.run()
+        processor = SegmentProcessor(args.video, args.subtitle, args.output, status_callback=print,
+                                     event_callback=print_stage_event if args.timings else None,
+                                     **processor_options)
+        run_instrumented(processor, args)
     except Exception as e:
         print(f"\nFatal Error: {e}")
         print("Please ensure FFmpeg is installed correctly.")
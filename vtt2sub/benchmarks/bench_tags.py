@@ -0,0 +1,152 @@
+"""Equivalence check and microbenchmark for the VTT cue-text tag stripper.
+
+Compares ``vtt2srt._strip_vtt_tags`` (single alternation scan) with the
+chained reference ``_strip_vtt_tags_chained`` (one ``re.sub`` per tag kind):
+
+  1. every line of the golden corpus (``tag_golden.jsonl``) must produce its
+     recorded output with both functions;
+  2. randomly generated lines built from tag fragments must produce identical
+     output with both functions;
+  3. both are timed on YouTube-style word-timed auto-caption lines
+     (``<00:00:05.680><c> word</c>``), plus any ``.vtt`` files given.
+
+Exits with code 1 on any mismatch.
+
+Usage (from the vtt2sub directory):
+    python benchmarks/bench_tags.py --lines 50000 --repeat 5 [captions.vtt ...]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+
+from vtt2srt import _strip_vtt_tags, _strip_vtt_tags_chained  # noqa: E402
+
+# Pieces the fuzzer glues together; chosen so removals can join into new tags
+_FRAGMENTS = [
+    "<", ">", "/", "c", "v", "b", "i", ".", "x", "0", "00:00:01.", "5", "000",
+    "<c>", "</c>", "<c.colorE5E5E5>", "<v.a>", "</v>", "<b>", "</i>", "<lang>",
+    "<00:00:05.680>", "<1:02:03.4>", " ", "  ", "\\N", "\\n", "\\h", "\\",
+    "word", "é",
+]
+
+
+def check_golden(path: Path) -> list[str]:
+    failures = []
+    with path.open(encoding="utf-8") as f:
+        for lineno, raw in enumerate(f, 1):
+            case = json.loads(raw)
+            for fn in (_strip_vtt_tags, _strip_vtt_tags_chained):
+                got = fn(case["input"])
+                if got != case["expected"]:
+                    failures.append(f"golden line {lineno}: {fn.__name__}({case['input']!r}) "
+                                    f"= {got!r}, expected {case['expected']!r}")
+    return failures
+
+
+def check_fuzz(count: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    failures = []
+    for _ in range(count):
+        line = "".join(rng.choice(_FRAGMENTS) for _ in range(rng.randint(1, 12)))
+        fast, ref = _strip_vtt_tags(line), _strip_vtt_tags_chained(line)
+        if fast != ref:
+            failures.append(f"fuzz: {line!r} -> {fast!r}, reference {ref!r}")
+    return failures
+
+
+def auto_caption_lines(count: int, seed: int) -> list[str]:
+    """YouTube-style rolling-caption text lines with word-level timing tags."""
+    rng = random.Random(seed)
+    words = "so today we are going to talk about the basic systems lecture right".split()
+    lines = []
+    ms = 0
+    for _ in range(count):
+        if rng.random() < 0.5:
+            # The repeated (already spoken) line of a rolling cue: plain text
+            lines.append(" ".join(rng.choices(words, k=rng.randint(4, 9))))
+            continue
+        parts = [rng.choice(words)]
+        for word in rng.choices(words, k=rng.randint(3, 8)):
+            ms += rng.randint(120, 400)
+            h, rest = divmod(ms, 3600000)
+            m, rest = divmod(rest, 60000)
+            s, milli = divmod(rest, 1000)
+            parts.append(f"<{h:02d}:{m:02d}:{s:02d}.{milli:03d}><c> {word}</c>")
+        lines.append("".join(parts))
+    return lines
+
+
+def vtt_text_lines(paths: list[str]) -> list[str]:
+    lines = []
+    for path in paths:
+        for line in Path(path).read_text(encoding="utf-8-sig").splitlines():
+            line = line.strip()
+            if line and "-->" not in line and line != "WEBVTT":
+                lines.append(line)
+    return lines
+
+
+def time_fn(fn, lines: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for line in lines:
+            fn(line)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and benchmark the VTT tag stripper")
+    parser.add_argument("vtt", nargs="*", help="Extra .vtt files to check and time")
+    parser.add_argument("--lines", type=int, default=50000, help="Synthetic auto-caption lines")
+    parser.add_argument("--fuzz", type=int, default=20000, help="Random lines for the equivalence check")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs (best is reported)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="Write results to this file instead of stdout")
+    args = parser.parse_args()
+
+    failures = check_golden(HERE / "tag_golden.jsonl") + check_fuzz(args.fuzz, args.seed)
+
+    corpora = {"auto_captions": auto_caption_lines(args.lines, args.seed)}
+    if args.vtt:
+        corpora["vtt_files"] = vtt_text_lines(args.vtt)
+
+    results = {}
+    for name, lines in corpora.items():
+        failures += [f"{name}: {line!r}" for line in lines
+                     if _strip_vtt_tags(line) != _strip_vtt_tags_chained(line)][:10]
+        chained = time_fn(_strip_vtt_tags_chained, lines, args.repeat)
+        single = time_fn(_strip_vtt_tags, lines, args.repeat)
+        results[name] = {
+            "lines": len(lines),
+            "chained_ms": chained * 1000,
+            "single_pass_ms": single * 1000,
+            "speedup": chained / single if single else 0.0,
+        }
+
+    output = json.dumps({
+        "python": sys.version.split()[0],
+        "results": results,
+        "failures": failures,
+    }, indent=2)
+    if args.json:
+        Path(args.json).write_text(output + "\n", encoding="utf-8")
+        print(f"Results written to {args.json}")
+    else:
+        print(output)
+
+    for failure in failures[:20]:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
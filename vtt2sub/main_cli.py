@@ -3,7 +3,38 @@
 import argparse
 import sys
 
-from vtt2srt import vtt_to_srt
+from vtt2srt import available_formats, convert_vtt, parse_formats, vtt_to_srt
+
+
+def _run_batch(args: argparse.Namespace) -> None:
+    """Convert every batch input in parallel and print an aggregate summary."""
+    from batch import build_jobs, convert_batch
+
+    if args.jobs < 0 or (args.chunksize is not None and args.chunksize < 1):
+        print("ERROR: --jobs must be >= 0 and --chunksize >= 1", file=sys.stderr)
+        sys.exit(1)
+
+    jobs = build_jobs(args.batch, args.out_dir, args.fmt, recursive=not args.no_recursive)
+    if not jobs:
+        print("ERROR: No .vtt files found.", file=sys.stderr)
+        sys.exit(1)
+
+    def _progress(done: int, total: int, src: str, error: str | None) -> None:
+        if error:
+            print(f"  FAIL: {src}: {error}", file=sys.stderr)
+        elif total <= 20:
+            print(f"  OK: {src}")
+        elif done % 1000 == 0 or done == total:
+            print(f"  {done}/{total} files...")
+
+    result = convert_batch(jobs, fmt=args.fmt, workers=args.jobs,
+                           chunksize=args.chunksize, progress=_progress, dedup=args.dedup)
+
+    print(f"Converted {len(result.converted)}/{result.total} file(s) in "
+          f"{result.elapsed:.1f}s ({result.files_per_sec:.0f} files/sec), "
+          f"{len(result.failed)} failed.")
+    if result.failed:
+        sys.exit(1)
 
 
 def main():
@@ -19,25 +50,55 @@ def main():
     )
     parser.add_argument(
         "-b", "--batch", nargs="+", default=None,
-        help="Batch convert multiple .vtt files.",
+        help="Batch convert .vtt files and/or directories (searched recursively).",
+    )
+    parser.add_argument(
+        "-d", "--out-dir", default=None,
+        help="Batch output root; directory trees are mirrored into it "
+             "(default: next to each source file).",
     )
     parser.add_argument(
-        "-f", "--fmt", default="lrc", choices=["lrc", "srt"],
-        help="Output format: lrc (compact) or srt (standard). Default: lrc.",
+        "-j", "--jobs", type=int, default=0,
+        help="Batch worker processes (0 = one per CPU core). Default: 0.",
+    )
+    parser.add_argument(
+        "--chunksize", type=int, default=None,
+        help="Batch files handed to a worker at a time (default: automatic).",
+    )
+    parser.add_argument(
+        "--no-recursive", action="store_true",
+        help="Batch: only take .vtt files directly inside the given directories.",
+    )
+    parser.add_argument(
+        "-f", "--fmt", default="lrc",
+        help=f"Output format(s), comma-separated to write several from one parse "
+             f"(e.g. srt,jsonl,txt). Choices: {', '.join(available_formats())}. Default: lrc.",
+    )
+    parser.add_argument(
+        "--dedup", action="store_true",
+        help="Collapse YouTube rolling auto-captions into clean, non-overlapping cues "
+             "(each line once, with its real end time).",
     )
     args = parser.parse_args()
 
     if not args.input and not args.batch:
         parser.error("Either provide an input file or use -b for batch mode.")
+    try:
+        fmts = parse_formats(args.fmt)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.batch:
+        _run_batch(args)
+        return
 
     try:
-        if args.batch:
-            for f in args.batch:
-                out = vtt_to_srt(f, fmt=args.fmt)
-                print(f"  OK: {f} -> {out}")
+        if len(fmts) == 1:
+            outs = [vtt_to_srt(args.input, args.output, fmt=fmts[0], dedup=args.dedup)]
         else:
-            out = vtt_to_srt(args.input, args.output, fmt=args.fmt)
-            print(f"OK: {args.input} -> {out}")
+            # -o gives the base path; each format gets its own extension
+            outs = convert_vtt(args.input, fmts, args.output, dedup=args.dedup)
+        print(f"OK: {args.input} -> {', '.join(outs)}")
     except FileNotFoundError as e:
         print(f"ERROR: {e}", file=sys.stderr)
         sys.exit(1)
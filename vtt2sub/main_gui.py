@@ -7,6 +7,16 @@ from pathlib import Path
 from tkinter import filedialog, messagebox, ttk
 
 
+# (format, checkbox label) for the Output Format selector
+_FORMAT_LABELS = [
+    ("lrc", "LRC  —  [00:05.07]Subtitle text  (compact, start time only)"),
+    ("srt", "SRT  —  standard SubRip format  (indexed, start & end times)"),
+    ("jsonl", "JSONL  —  one {start_ms, end_ms, text} record per cue"),
+    ("txt", "TXT  —  plain transcript  (text only, one cue per line)"),
+    ("ass", "ASS  —  Advanced SubStation Alpha  (default style)"),
+]
+
+
 class CheckboxListFrame(ttk.Frame):
     """A scrollable frame with a checkbox per item."""
 
@@ -79,7 +89,7 @@ class Vtt2SrtApp:
     def __init__(self, root: tk.Tk):
         self.root = root
         root.title("VTT Subtitle Converter")
-        root.geometry("600x550")
+        root.geometry("600x650")
         root.resizable(True, True)
 
         frame = ttk.Frame(root, padding=16)
@@ -111,7 +121,11 @@ class Vtt2SrtApp:
         ttk.Label(
             src_frame, text='Pick a folder \u2192 click "Scan" to load .vtt files.',
             foreground="gray",
-        ).grid(row=1, column=0, columnspan=2, sticky="w", pady=(4, 0))
+        ).grid(row=1, column=0, sticky="w", pady=(4, 0))
+        self.recursive_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(
+            src_frame, text="Include subfolders", variable=self.recursive_var,
+        ).grid(row=1, column=1, sticky="e", padx=(0, 4), pady=(4, 0))
 
         # ---- file list with checkboxes ---------------------------------------
         list_frame = ttk.LabelFrame(frame, text="Files to Convert", padding=8)
@@ -139,16 +153,19 @@ class Vtt2SrtApp:
         fmt_frame = ttk.LabelFrame(frame, text="Output Format", padding=8)
         fmt_frame.grid(row=3, column=0, sticky="ew", pady=(0, 4))
 
-        self.fmt_var = tk.StringVar(value="lrc")
-        ttk.Radiobutton(
-            fmt_frame, text="LRC  —  [00:05.07]Subtitle text  (compact, start time only)",
-            variable=self.fmt_var, value="lrc",
-        ).pack(anchor="w")
-        ttk.Radiobutton(
+        # All ticked formats are written from a single parse of each file
+        self.fmt_vars: dict[str, tk.BooleanVar] = {}
+        for fmt, label in _FORMAT_LABELS:
+            self.fmt_vars[fmt] = tk.BooleanVar(value=fmt == "lrc")
+            ttk.Checkbutton(
+                fmt_frame, text=label, variable=self.fmt_vars[fmt],
+            ).pack(anchor="w", pady=(0, 2))
+        self.dedup_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
             fmt_frame,
-            text="SRT  —  standard SubRip format  (indexed, start & end times)",
-            variable=self.fmt_var, value="srt",
-        ).pack(anchor="w", pady=(2, 0))
+            text="Merge rolling auto-captions (YouTube)  —  each line once, no overlaps",
+            variable=self.dedup_var,
+        ).pack(anchor="w", pady=(6, 0))
 
         # ---- output directory -------------------------------------------------
         out_frame = ttk.LabelFrame(frame, text="Output Directory", padding=8)
@@ -164,7 +181,8 @@ class Vtt2SrtApp:
         ).grid(row=0, column=2, sticky="e")
         ttk.Label(
             out_frame,
-            text="Leave empty to save files next to the original .vtt files.",
+            text="Leave empty to save files next to the original .vtt files. "
+                 "Subfolders of the source folder are mirrored.",
             foreground="gray",
         ).grid(row=1, column=0, columnspan=3, sticky="w", pady=(4, 0))
 
@@ -218,11 +236,10 @@ class Vtt2SrtApp:
             messagebox.showerror("Invalid Folder", f"Folder not found:\n{src_dir}")
             return
 
+        from batch import discover_vtt
+
         self._clear()
-        vtt_files = sorted(
-            p for p in Path(src_dir).iterdir()
-            if p.is_file() and p.suffix.lower() == ".vtt"
-        )
+        vtt_files = discover_vtt(src_dir, recursive=self.recursive_var.get())
         if not vtt_files:
             messagebox.showinfo("No VTT Files", f"No .vtt files found in:\n{src_dir}")
             return
@@ -266,30 +283,42 @@ class Vtt2SrtApp:
             messagebox.showwarning("No Files", "Select at least one file to convert.")
             return
 
-        fmt = self.fmt_var.get()
-        ext = f".{fmt}"
+        fmts = [fmt for fmt, var in self.fmt_vars.items() if var.get()]
+        if not fmts:
+            messagebox.showwarning("No Format", "Select at least one output format.")
+            return
+        fmt = ",".join(fmts)
+        dedup = self.dedup_var.get()
+        ext = f".{fmts[0]}"
         out_dir = self.out_dir_var.get().strip()
+        src_dir = self.src_dir_var.get().strip()
         total = len(files)
-        failed: list[str] = []
         self.progress["maximum"] = total
         self.progress["value"] = 0
         self.status_label.configure(text="Converting...")
 
-        from vtt2srt import vtt_to_srt
+        from batch import convert_batch
 
-        def _worker():
-            for i, src in enumerate(files):
-                try:
-                    if out_dir:
-                        out_name = Path(src).with_suffix(ext).name
-                        out_path = os.path.join(out_dir, out_name)
-                        vtt_to_srt(src, out_path, fmt=fmt)
-                    else:
-                        vtt_to_srt(src, fmt=fmt)
-                except Exception as e:
-                    failed.append(f"{os.path.basename(src)}: {e}")
-                self.root.after(0, lambda idx=i: self._tick(idx, total))
+        jobs = []
+        for src in files:
+            out_path = None
+            if out_dir:
+                # Files found by Scan keep their place below the source folder
+                rel = Path(src).name
+                if src_dir and Path(src).is_relative_to(src_dir):
+                    rel = Path(src).relative_to(src_dir)
+                out_path = str(Path(out_dir, rel).with_suffix(ext))
+            jobs.append((src, out_path))
+
+        step = max(1, total // 200)  # don't flood the Tk event queue on huge batches
 
+        def _progress(done, _total, _src, _error):
+            if done % step == 0 or done == total:
+                self.root.after(0, lambda idx=done - 1: self._tick(idx, total))
+
+        def _worker():
+            result = convert_batch(jobs, fmt=fmt, progress=_progress, dedup=dedup)
+            failed = [f"{os.path.basename(src)}: {e}" for src, e in result.failed]
             self.root.after(0, lambda: self._done(total, failed))
 
         threading.Thread(target=_worker, daemon=True).start()
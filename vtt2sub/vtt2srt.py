@@ -1,13 +1,28 @@
 """VTT subtitle converter — pure stdlib, zero dependencies.
 
-Supports two output formats:
-
-  LRC  — [MM:SS.ms]Text (compact, start time only)
-  SRT  — standard SubRip format (indexed, start --> end)
+Supported output formats:
+
+  LRC   — [MM:SS.ms]Text (compact, start time only)
+  SRT   — standard SubRip format (indexed, start --> end)
+  JSONL — one {"start_ms", "end_ms", "text"} object per cue
+  TXT   — plain transcript, one cue per line
+  ASS   — Advanced SubStation Alpha with a single default style
+
+Conversion is streamed: file lines -> cue records (:func:`iter_cues`) ->
+incremental format writers, one cue at a time. Several formats can be
+written in the same pass (:func:`convert_vtt`); new ones are added with
+:func:`register_writer`.
 """
 
+import io
+import itertools
+import json
+import os
 import re
+from collections import deque
+from contextlib import ExitStack
 from pathlib import Path
+from typing import Iterable, Iterator, TextIO
 
 # Flexible VTT timestamp regex — supports:
 #   HH:MM:SS.mmm   (hours optional, ms 2-3 digits)
@@ -21,13 +36,15 @@ _TS_RE = re.compile(
 
 
 def vtt_to_srt(vtt_path: str | Path, srt_path: str | Path | None = None,
-               fmt: str = "lrc") -> str:
-    """Convert a WebVTT file to LRC or SRT format.
+               fmt: str = "lrc", dedup: bool = False) -> str:
+    """Convert a WebVTT file to one output format.
 
     Args:
         vtt_path: Path to the source .vtt file.
         srt_path: Path for the output file (default: same name, extension from *fmt*).
-        fmt: Output format — ``"lrc"`` or ``"srt"``.
+        fmt: Output format, one of :func:`available_formats` (e.g. ``"lrc"``, ``"srt"``).
+        dedup: Collapse YouTube rolling auto-captions into clean,
+            non-overlapping cues first (see :func:`dedup_rolling`).
 
     Returns:
         The path where the output file was written.
@@ -37,95 +54,253 @@ def vtt_to_srt(vtt_path: str | Path, srt_path: str | Path | None = None,
         ValueError: If the file contains no valid subtitle cues or *fmt* is unknown.
     """
     fmt = fmt.lower()
-    if fmt not in ("lrc", "srt"):
-        raise ValueError(f"Unknown format: {fmt!r}. Choose 'lrc' or 'srt'.")
+    if fmt not in _WRITERS:
+        raise ValueError(f"Unknown format: {fmt!r}. Choose from: {', '.join(_WRITERS)}.")
+
+    vtt_path = Path(vtt_path)
+    out_path = Path(srt_path) if srt_path is not None else vtt_path.with_suffix(f".{fmt}")
+    return _convert(vtt_path, {fmt: out_path}, dedup)[0]
+
 
+def convert_vtt(vtt_path: str | Path, fmts: str | Iterable[str] = "lrc",
+                out_path: str | Path | None = None, dedup: bool = False) -> list[str]:
+    """Convert a WebVTT file to several formats in a single parsing pass.
+
+    Args:
+        vtt_path: Path to the source .vtt file.
+        fmts: Formats to write, as a list or a comma-separated string
+            (``"srt,jsonl,txt"``).
+        out_path: Output path; every format is written next to it with its
+            own extension (default: next to *vtt_path*).
+        dedup: Collapse YouTube rolling auto-captions first.
+
+    Returns:
+        The written paths, in the order of *fmts*.
+
+    Raises:
+        FileNotFoundError: If *vtt_path* does not exist.
+        ValueError: If the file contains no valid subtitle cues or a format is unknown.
+    """
     vtt_path = Path(vtt_path)
+    base = Path(out_path) if out_path is not None else vtt_path
+    return _convert(vtt_path, {fmt: base.with_suffix(f".{fmt}") for fmt in parse_formats(fmts)}, dedup)
 
+
+def parse_formats(fmts: str | Iterable[str]) -> list[str]:
+    """Normalize ``"srt,JSONL"`` / ``["srt", "jsonl"]`` to a checked, de-duplicated list.
+
+    Raises:
+        ValueError: If the list is empty or names an unknown format.
+    """
+    if isinstance(fmts, str):
+        fmts = fmts.split(",")
+    names = list(dict.fromkeys(f.strip().lower() for f in fmts if f.strip()))
+    unknown = [f for f in names if f not in _WRITERS]
+    if not names or unknown:
+        raise ValueError(f"Unknown format: {', '.join(unknown) or '(none)'}. "
+                         f"Choose from: {', '.join(_WRITERS)}.")
+    return names
+
+
+def _convert(vtt_path: Path, outputs: dict[str, Path], dedup: bool) -> list[str]:
+    """Stream *vtt_path* once into every ``{fmt: path}`` output.
+
+    Lines are parsed into cues one at a time and each cue goes to every writer
+    as soon as it is complete, so memory use does not grow with the length of
+    the file. Each output goes to a temporary ``.part`` file that replaces the
+    target only once the whole conversion has succeeded.
+    """
     if not vtt_path.exists():
         raise FileNotFoundError(f"File not found: {vtt_path}")
 
-    ext = f".{fmt}"
-    if srt_path is None:
-        srt_path = vtt_path.with_suffix(ext)
-    else:
-        srt_path = Path(srt_path)
+    parts = {fmt: path.with_name(path.name + ".part") for fmt, path in outputs.items()}
+    try:
+        with ExitStack() as stack:
+            # Universal newlines: "\r\n" and "\r" arrive as "\n"
+            src = stack.enter_context(vtt_path.open(encoding="utf-8-sig"))
+            writers = [
+                _WRITERS[fmt](stack.enter_context(part.open("w", encoding="utf-8", newline="\n")))
+                for fmt, part in parts.items()
+            ]
+            count = 0
+            cues = iter_cues(src)
+            if dedup:
+                cues = dedup_rolling(cues)
+            for cue in cues:
+                for writer in writers:
+                    writer.write(cue)
+                count += 1
+            for writer in writers:
+                writer.close()
+        if not count:
+            raise ValueError("No valid subtitle cues found in VTT file")
+        for fmt, part in parts.items():
+            os.replace(part, outputs[fmt])
+    except BaseException:
+        for part in parts.values():
+            part.unlink(missing_ok=True)
+        raise
+    return [str(path) for path in outputs.values()]
 
-    raw = vtt_path.read_text(encoding="utf-8-sig")
 
-    # ---- strip WEBVTT header block -----------------------------------------
-    body = _strip_header(raw)
-    if not body:
-        raise ValueError("No subtitle content found in VTT file")
+# ------------------------------------------------------------------
+# Streaming parser
+# ------------------------------------------------------------------
 
-    # ---- split into cue blocks by double-newlines --------------------------
-    # YouTube VTT puts a whitespace-only line inside each cue, so using
-    # single blank lines as separators would break cues apart.
-    raw_blocks = re.split(r"\n{2,}", body)
+def iter_cues(lines: Iterable[str]) -> Iterator[dict]:
+    """Parse VTT *lines* (e.g. an open file) into cue records, one at a time.
 
-    cues: list[dict] = []
-    for raw_block in raw_blocks:
-        lines = raw_block.splitlines()
-        ts_line = ""
-        text_lines: list[str] = []
+    Each cue is a dict with ``start`` / ``end`` ``(h, m, s, ms)`` tuples and
+    ``text_lines`` (markup stripped). Only the current cue block is held in
+    memory.
+
+    Raises:
+        ValueError: If there is no subtitle content after the header.
+    """
+    lines = iter(lines)
+    body_seen = False
 
+    # ---- skip WEBVTT header block (up to the first blank line) ------------
+    first = next(lines, None)
+    if first is None:
+        raise ValueError("No subtitle content found in VTT file")
+    if first.startswith("WEBVTT"):
+        header: list[str] = []
         for line in lines:
-            stripped = line.strip()
-            if not stripped:
-                continue  # skip whitespace-only lines within a cue
-            if "-->" in stripped:
-                ts_line = stripped
-            elif not stripped.startswith(("NOTE", "STYLE", "REGION")):
-                clean = _strip_vtt_tags(stripped)
-                if clean:
-                    text_lines.append(clean)
-
-        if not ts_line or not text_lines:
+            if not line.rstrip("\r\n"):
+                break
+            header.append(line)
+            if "-->" in line:
+                # A timing line before any blank line: the header was not
+                # terminated, so only the WEBVTT line itself is the header.
+                # Stop buffering here and stream the rest.
+                lines = itertools.chain(header, lines)
+                break
+        else:
+            # No blank line and no timing line: only short metadata was buffered
+            lines = iter(header)
+    else:
+        lines = itertools.chain([first], lines)
+
+    # ---- cue blocks are separated by empty lines ---------------------------
+    # YouTube VTT puts a whitespace-only line inside each cue, so only truly
+    # empty lines end a block.
+    ts_line = ""
+    text_lines: list[str] = []
+    for line in itertools.chain(lines, [""]):
+        if not line.rstrip("\r\n"):
+            if ts_line and text_lines:
+                m = _TS_RE.search(ts_line)
+                if m:
+                    yield {
+                        "start": _parse_ts_groups(m, 1),
+                        "end":   _parse_ts_groups(m, 5),
+                        "text_lines": text_lines,
+                    }
+            ts_line = ""
+            text_lines = []
             continue
 
-        m = _TS_RE.search(ts_line)
-        if not m:
-            continue
+        stripped = line.strip()
+        if not stripped:
+            continue  # skip whitespace-only lines within a cue
+        body_seen = True
+        if "-->" in stripped:
+            ts_line = stripped
+        elif not stripped.startswith(("NOTE", "STYLE", "REGION")):
+            clean = _strip_vtt_tags(stripped)
+            if clean:
+                text_lines.append(clean)
+
+    if not body_seen:
+        raise ValueError("No subtitle content found in VTT file")
+
 
-        cues.append({
-            "start": _parse_ts_groups(m, 1),
-            "end":   _parse_ts_groups(m, 5),
-            "text_lines": text_lines,
-        })
+# ------------------------------------------------------------------
+# Rolling-caption dedup
+# ------------------------------------------------------------------
 
-    if not cues:
-        raise ValueError("No valid subtitle cues found in VTT file")
+def dedup_rolling(cues: Iterable[dict]) -> Iterator[dict]:
+    """Collapse YouTube "scroll-up" auto-captions into non-overlapping cues.
+
+    Rolling captions repeat the previous line(s) at the top of every cue and
+    add a short transition cue per line, so each line is shown two or three
+    times. In one linear pass, the lines a cue shares with the tail of the
+    previous cue are dropped; only new lines start an output cue. A cue with
+    nothing new extends the current output cue, a line that grows the last
+    one (``"so today"`` -> ``"so today we"``) replaces it, and each output cue
+    ends no later than the next one starts.
+
+    Args:
+        cues: Cue records as produced by :func:`iter_cues`.
+
+    Yields:
+        Cue records in the same format, in order.
+    """
+    prev_lines: list[str] = []
+    pending: dict | None = None
+    for cue in cues:
+        lines = cue["text_lines"]
+        new = lines[_rolling_overlap(prev_lines, lines):]
+        prev_lines = lines
+
+        if pending is not None:
+            last = pending["text_lines"][-1]
+            if new and new[0] != last and new[0].startswith(last):
+                pending["text_lines"][-1] = new[0]
+                new = new[1:]
+            if not new:
+                pending["end"] = max(pending["end"], cue["end"])
+                continue
+            pending["end"] = max(pending["start"], min(pending["end"], cue["start"]))
+            yield pending
+
+        pending = {"start": cue["start"], "end": cue["end"], "text_lines": new}
+
+    if pending is not None:
+        yield pending
 
-    # ---- write output -------------------------------------------------------
-    if fmt == "lrc":
-        output = _build_lrc(cues)
-    else:
-        output = _build_srt(cues)
 
-    srt_path.write_text(output, encoding="utf-8")
-    return str(srt_path)
+def _rolling_overlap(prev: list[str], cur: list[str]) -> int:
+    """Length of the longest head of *cur* that repeats the tail of *prev*."""
+    for k in range(min(len(prev), len(cur)), 0, -1):
+        if cur[:k] == prev[-k:]:
+            return k
+    return 0
 
 
 # ------------------------------------------------------------------
 # Helpers
 # ------------------------------------------------------------------
 
-def _strip_header(raw: str) -> str:
-    """Remove the WEBVTT header block (up to the first blank line)."""
-    if not raw.startswith("WEBVTT"):
-        return raw.strip()
-    raw = raw.replace("\r\n", "\n").replace("\r", "\n")
-    idx = raw.find("\n\n")
-    if idx == -1:
-        idx = raw.find("\n")
-        if idx == -1:
-            return ""
-        return raw[idx + 1:].strip()
-    return raw[idx + 2:].strip()
+# Every tag the stripper removes, as one alternation: word-level timestamps
+# <00:00:05.680>, class/voice spans <c.xxx>/<v.xxx>, and <b>, <i>, <u>, <lang> ...
+_TAG_RE = re.compile(r"<(?:\d+:\d{2}:\d{2}\.\d{1,3}|/?[cv](?:\.\w+)*|/?[a-z]+)>")
+_SPACES_RE = re.compile(r" {2,}")
 
 
 def _strip_vtt_tags(line: str) -> str:
-    """Strip all VTT markup: <c>, <v>, <b>, <i>, word-level timestamps, etc."""
+    """Strip all VTT markup: <c>, <v>, <b>, <i>, word-level timestamps, etc.
+
+    One scan with :data:`_TAG_RE` instead of one ``re.sub`` per tag kind; escape
+    and space handling only run when the line contains a backslash / double space.
+    """
+    if "<" in line:
+        stripped = _TAG_RE.sub("", line)
+        if "<" in stripped:
+            # A removal may join text into a new tag, e.g. "<<c>b>"; the chained
+            # passes would strip that too, so let them handle the (rare) line.
+            return _strip_vtt_tags_chained(line)
+        line = stripped
+    if "\\" in line:
+        line = line.replace("\\N", "\n").replace("\\n", "\n").replace("\\h", "")
+    if "  " in line:
+        line = _SPACES_RE.sub(" ", line)
+    return line.strip()
+
+
+def _strip_vtt_tags_chained(line: str) -> str:
+    """Reference stripper: one ``re.sub`` pass per tag kind, in a fixed order."""
     # Remove word-level timestamp tags like <00:00:05.680>
     line = re.sub(r"<\d+:\d{2}:\d{2}\.\d{1,3}>", "", line)
     # Remove <c.xxx>, <c>, </c> (color/class spans — multi-class support)
@@ -156,47 +331,191 @@ def _parse_ts_groups(m: re.Match, base: int) -> tuple[int, int, int, int]:
 # Format builders
 # ------------------------------------------------------------------
 
-def _build_lrc(cues: list[dict]) -> str:
-    """Build LRC output — deduplicate overlapping text, merge same-timestamp lines."""
-    entries: list[tuple[str, str]] = []  # (timestamp, text)
-    seen: set[str] = set()
-    for cue in cues:
+# Output writers by format name. A writer is constructed with the open output
+# text file, receives every cue through write(cue) and finishes with close().
+_WRITERS: dict[str, type] = {}
+
+
+def register_writer(fmt: str):
+    """Class decorator registering a cue writer for output format *fmt*."""
+    def _register(cls: type) -> type:
+        _WRITERS[fmt.lower()] = cls
+        return cls
+    return _register
+
+
+def available_formats() -> list[str]:
+    """Names of all registered output formats, in registration order."""
+    return list(_WRITERS)
+
+
+@register_writer("lrc")
+class _LrcWriter:
+    """LRC output — deduplicate overlapping text, merge same-timestamp lines.
+
+    A line is held back until the next entry shows whether it continues at
+    the same timestamp; the dedup window re-seeds from the last 5 entries
+    once more than 20 texts have been seen.
+    """
+
+    def __init__(self, out: TextIO):
+        self._out = out
+        self._seen: set[str] = set()
+        self._recent: deque[str] = deque(maxlen=5)
+        self._ts = ""
+        self._line = ""
+
+    def write(self, cue: dict) -> None:
         h, m, s, ms = cue["start"]
         total_min = h * 60 + m
         cs = ms // 10  # truncate to 2 digits (hundredths of a second)
         ts = f"[{total_min:02d}:{s:02d}.{cs:02d}]"
         for text in cue["text_lines"]:
-            if text in seen:
+            if text in self._seen:
                 continue
-            entries.append((ts, text))
-            seen.add(text)
-            if len(seen) > 20:
+            self._recent.append(text)
+            self._seen.add(text)
+            if len(self._seen) > 20:
                 # Re-seed from last 5 output entries
-                seen.clear()
-                for prev_ts, prev_text in entries[-5:]:
-                    seen.add(prev_text)
-
-    # Merge consecutive entries with the same timestamp
-    lines: list[str] = []
-    for ts, text in entries:
-        if lines and lines[-1].startswith(ts):
-            lines[-1] = f"{ts}{lines[-1][len(ts):]} {text}"
-        else:
-            lines.append(f"{ts}{text}")
-    return "\n".join(lines) + "\n"
+                self._seen = set(self._recent)
+
+            # Merge consecutive entries with the same timestamp
+            if self._line and ts == self._ts:
+                self._line = f"{self._line} {text}"
+            else:
+                self._flush()
+                self._ts, self._line = ts, f"{ts}{text}"
 
+    def _flush(self) -> None:
+        if self._line:
+            self._out.write(self._line + "\n")
 
-def _build_srt(cues: list[dict]) -> str:
-    """Build standard SRT output — multi-line text preserved with \\n."""
-    blocks: list[str] = []
-    for i, cue in enumerate(cues, 1):
+    def close(self) -> None:
+        self._flush()
+        self._line = ""
+
+
+@register_writer("srt")
+class _SrtWriter:
+    """Standard SRT output — multi-line text preserved with \\n."""
+
+    def __init__(self, out: TextIO):
+        self._out = out
+        self._index = 0
+
+    def write(self, cue: dict) -> None:
+        self._index += 1
         start = _fmt_srt_ts(*cue["start"])
         end   = _fmt_srt_ts(*cue["end"])
         text = "\n".join(cue["text_lines"])
-        blocks.append(f"{i}\n{start} --> {end}\n{text}")
-    return "\n\n".join(blocks) + "\n"
+        sep = "\n" if self._index > 1 else ""
+        self._out.write(f"{sep}{self._index}\n{start} --> {end}\n{text}\n")
+
+    def close(self) -> None:
+        pass
+
+
+@register_writer("jsonl")
+class _JsonlWriter:
+    """JSON Lines output — ``{"start_ms", "end_ms", "text"}`` per cue, lines joined with \\n."""
+
+    def __init__(self, out: TextIO):
+        self._out = out
+
+    def write(self, cue: dict) -> None:
+        record = {
+            "start_ms": _to_ms(*cue["start"]),
+            "end_ms": _to_ms(*cue["end"]),
+            "text": "\n".join(cue["text_lines"]),
+        }
+        self._out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def close(self) -> None:
+        pass
+
+
+@register_writer("txt")
+class _TxtWriter:
+    """Plain transcript — the text of each cue on one line, no timings."""
+
+    def __init__(self, out: TextIO):
+        self._out = out
+
+    def write(self, cue: dict) -> None:
+        self._out.write(" ".join(cue["text_lines"]) + "\n")
+
+    def close(self) -> None:
+        pass
+
+
+_ASS_HEADER = """\
+[Script Info]
+ScriptType: v4.00+
+PlayResX: 384
+PlayResY: 288
+WrapStyle: 0
+ScaledBorderAndShadow: yes
+
+[V4+ Styles]
+Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, \
+Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, \
+Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
+Style: Default,Arial,16,&H00FFFFFF,&H000000FF,&H00000000,&H80000000,0,0,0,0,100,100,0,0,1,1,0,2,10,10,10,1
+
+[Events]
+Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+"""
+
+
+@register_writer("ass")
+class _AssWriter:
+    """ASS output — one Dialogue event per cue in a single ``Default`` style."""
+
+    def __init__(self, out: TextIO):
+        self._out = out
+        out.write(_ASS_HEADER)
+
+    def write(self, cue: dict) -> None:
+        start = _fmt_ass_ts(*cue["start"])
+        end = _fmt_ass_ts(*cue["end"])
+        # Braces would open an override block; \\N is the ASS line break
+        text = "\\N".join(cue["text_lines"]).replace("{", "\\{").replace("}", "\\}")
+        text = text.replace("\n", "\\N")
+        self._out.write(f"Dialogue: 0,{start},{end},Default,,0,0,0,,{text}\n")
+
+    def close(self) -> None:
+        pass
+
+
+def _build(writer_cls: type, cues: Iterable[dict]) -> str:
+    buf = io.StringIO()
+    writer = writer_cls(buf)
+    for cue in cues:
+        writer.write(cue)
+    writer.close()
+    return buf.getvalue()
+
+
+def _build_lrc(cues: Iterable[dict]) -> str:
+    """Build LRC output in memory (see :class:`_LrcWriter`)."""
+    return _build(_LrcWriter, cues)
+
+
+def _build_srt(cues: Iterable[dict]) -> str:
+    """Build standard SRT output in memory (see :class:`_SrtWriter`)."""
+    return _build(_SrtWriter, cues)
 
 
 def _fmt_srt_ts(h: int, m: int, s: int, ms: int) -> str:
     """Format a timestamp as SRT: ``HH:MM:SS,mmm``."""
     return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+
+
+def _fmt_ass_ts(h: int, m: int, s: int, ms: int) -> str:
+    """Format a timestamp as ASS: ``H:MM:SS.cc``."""
+    return f"{h}:{m:02d}:{s:02d}.{ms // 10:02d}"
+
+
+def _to_ms(h: int, m: int, s: int, ms: int) -> int:
+    """Convert an ``(h, m, s, ms)`` timestamp to milliseconds."""
+    return ((h * 60 + m) * 60 + s) * 1000 + ms